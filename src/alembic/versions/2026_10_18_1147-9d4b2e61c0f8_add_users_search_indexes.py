@@ -0,0 +1,56 @@
+"""add users search indexes
+
+Revision ID: 9d4b2e61c0f8
+Revises: 5c1e8f3a9b27
+Create Date: 2026-10-18 11:47:05.204611
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4b2e61c0f8"
+down_revision: Union[str, Sequence[str], None] = "5c1e8f3a9b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY does not block writes to users, but can not run in a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_phone_number_pattern",
+            "users",
+            ["phone_number"],
+            unique=False,
+            postgresql_ops={"phone_number": "text_pattern_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_users_full_name_trgm",
+            "users",
+            ["full_name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_full_name_trgm",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_users_phone_number_pattern",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,41 @@
+"""add users full name full text index
+
+Revision ID: 4f7a1c9e2b6d
+Revises: 9d4b2e61c0f8
+Create Date: 2026-10-19 09:30:12.418305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = "4f7a1c9e2b6d"
+down_revision: Union[str, Sequence[str], None] = "9d4b2e61c0f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_full_name_fts",
+            "users",
+            [text("to_tsvector('simple'::regconfig, full_name)")],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_full_name_fts",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
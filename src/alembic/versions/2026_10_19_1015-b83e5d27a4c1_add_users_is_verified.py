@@ -0,0 +1,53 @@
+"""add users is_verified
+
+Revision ID: b83e5d27a4c1
+Revises: 4f7a1c9e2b6d
+Create Date: 2026-10-19 10:15:47.209841
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b83e5d27a4c1"
+down_revision: Union[str, Sequence[str], None] = "4f7a1c9e2b6d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # existing users count as verified, so the cleanup task keeps them
+    op.add_column(
+        "users",
+        sa.Column(
+            "is_verified",
+            sa.Boolean(),
+            server_default="true",
+            nullable=False,
+        ),
+    )
+    op.alter_column("users", "is_verified", server_default="false")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_unverified_created_at",
+            "users",
+            ["created_at"],
+            unique=False,
+            postgresql_where=sa.text("is_verified IS false"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_unverified_created_at",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("users", "is_verified")
@@ -3,6 +3,7 @@ from fastapi import APIRouter
 from core.config import settings
 
 from .auth import router as auth_router
+from .metrics import router as metrics_router
 from .user import router as user_router
 
 router = APIRouter(
@@ -11,3 +12,4 @@ router = APIRouter(
 
 router.include_router(auth_router)
 router.include_router(user_router)
+router.include_router(metrics_router)
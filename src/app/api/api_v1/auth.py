@@ -7,7 +7,7 @@ from fastapi import (
 )
 
 from app.api.dependencies.auth import AuthServiceDep, AuthServiceTxDep
-from app.rate_limiter import get_default_rate_limit, limiter
+from app.rate_limiter import get_client_ip, rate_limit
 from app.schemas.auth import LoginWithPhone
 from app.schemas.token import RefreshToken, TokenInfo
 from app.schemas.user import UserCreate, UserRead
@@ -77,16 +77,27 @@ async def register(
                 }
             },
         },
+        status.HTTP_429_TOO_MANY_REQUESTS: {
+            "description": "Too many login attempts or failures, see the Retry-After header",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "Too many requests",
+                        "details": None,
+                    }
+                }
+            },
+        },
     },
 )
-@limiter.limit(get_default_rate_limit())
+@rate_limit()
 async def login(
     request: Request,
     auth_service: AuthServiceTxDep,
     login_data: LoginWithPhone,
 ):
     """Login a user with the provided phone and password."""
-    return await auth_service.login(login_data)
+    return await auth_service.login(login_data, client_ip=get_client_ip(request))
 
 
 @router.post(
@@ -95,6 +106,8 @@ async def login(
     response_model=TokenInfo,
     description="""
     Refreshes an access token using a refresh token.
+    The refresh token is rotated: the response carries a new one and the presented
+    token stops working. Reusing a rotated-out token revokes the whole session.
     """,
     responses={
         status.HTTP_200_OK: {
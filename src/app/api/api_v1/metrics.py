@@ -0,0 +1,66 @@
+import logging
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    status,
+)
+
+from app.api.dependencies.auth import get_current_auth_admin
+from app.auth.login_throttle import login_throttle
+from app.auth.password_hasher import password_hasher
+from app.auth.refresh_tokens import refresh_tokens
+from app.auth.token_cache import token_cache
+from app.cache import user_cache
+from app.clients.redis import redis_client
+from app.db.db_helper import db_helper
+from app.db.query_log import slow_query_log
+from app.db.replica_router import replica_router
+from app.db.session_dep import session_manager
+from app.rate_limiter import local_rate_limiter
+from core.config import settings
+
+log = logging.getLogger(__name__)
+router = APIRouter(
+    prefix=settings.api.v1.metrics,
+    tags=["Metrics"],
+)
+
+
+@router.get(
+    "",
+    summary="Get runtime metrics",
+    description="Retrieve load counters of the worker that served the request. This endpoint is restricted to administrators only.",
+    dependencies=[Depends(get_current_auth_admin)],
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Runtime metrics retrieved successfully",
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Admin privileges required",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "You are not authorized to perform this action",
+                        "details": None,
+                    }
+                }
+            },
+        },
+    },
+)
+async def get_metrics() -> dict:
+    """Get runtime metrics of the current worker (Admin only)"""
+    return {
+        "password_hasher": password_hasher.stats(),
+        "token_cache": token_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "db_pool": db_helper.pool_stats(),
+        "db_replicas": replica_router.stats(),
+        "db_sessions": session_manager.stats(),
+        "db_slow_queries": slow_query_log.stats(),
+        "redis": redis_client.stats(),
+        "rate_limiter": local_rate_limiter.stats(),
+        "login_throttle": login_throttle.stats(),
+        "refresh_tokens": refresh_tokens.stats(),
+    }
@@ -1,15 +1,24 @@
 import logging
+from typing import Annotated, Optional
 
 from fastapi import (
     APIRouter,
     Depends,
+    Query,
+    UploadFile,
     status,
 )
+from fastapi.responses import StreamingResponse
 
 from app.api.dependencies.auth import CurrentUserDep, get_current_auth_admin
 from app.api.dependencies.user import UserServiceDep, UserServiceTxDep
+from app.db.session_dep import session_manager
+from app.schemas.pagination import Page
 from app.schemas.user import UserRead, UserUpdate
+from app.schemas.user_import import UserImportReport
 from core.config import settings
+from core.enums.file_format import FileFormat
+from core.exceptions import PayloadTooLargeError
 
 log = logging.getLogger(__name__)
 router = APIRouter(
@@ -51,13 +60,27 @@ async def get_me(
 @router.get(
     "",
     summary="Get all users",
-    description="Retrieve a list of all users in the system. This endpoint is restricted to administrators only.",
-    response_model=list[UserRead],
-    dependencies=[Depends(get_current_auth_admin)],
+    description="Retrieve a page of users in the system, newest first, optionally searched by phone number prefix or part of the full name. Pass `next_cursor` of a page as `cursor` to get the next one. This endpoint is restricted to administrators only.",
+    response_model=Page[UserRead],
+    dependencies=[
+        Depends(get_current_auth_admin),
+        session_manager.statement_timeout(settings.db.search_statement_timeout),
+    ],
     responses={
         status.HTTP_200_OK: {
-            "description": "List of all users retrieved successfully",
-            "model": list[UserRead],
+            "description": "Page of users retrieved successfully",
+            "model": Page[UserRead],
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Invalid cursor",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "Invalid cursor",
+                        "details": None,
+                    }
+                }
+            },
         },
         status.HTTP_401_UNAUTHORIZED: {
             "description": "Authentication required",
@@ -85,9 +108,157 @@ async def get_me(
 )
 async def get_all_users(
     user_service: UserServiceDep,
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+    cursor: Optional[str] = None,
+    phone_number: Annotated[
+        Optional[str], Query(description="Phone number prefix")
+    ] = None,
+    full_name: Annotated[
+        Optional[str], Query(description="Part of the full name")
+    ] = None,
+):
+    """Get a page of users in the system (Admin only)"""
+    filters = {
+        key: value
+        for key, value in {
+            "phone_number": phone_number,
+            "full_name": full_name,
+        }.items()
+        if value
+    }
+    return await user_service.get_all_users(
+        limit=limit,
+        cursor=cursor,
+        filters=filters,
+    )
+
+
+@router.get(
+    "/export",
+    summary="Export all users",
+    description="Stream every user in the system as NDJSON (one JSON object per line) or CSV. This endpoint is restricted to administrators only.",
+    response_class=StreamingResponse,
+    dependencies=[Depends(get_current_auth_admin)],
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Users export streamed successfully",
+            "content": {
+                "application/x-ndjson": {},
+                "text/csv": {},
+            },
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Authentication required",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "Invalid token",
+                        "details": None,
+                    }
+                }
+            },
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Admin privileges required",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "You are not authorized to perform this action",
+                        "details": None,
+                    }
+                }
+            },
+        },
+    },
+)
+async def export_users(
+    user_service: UserServiceDep,
+    export_format: Annotated[FileFormat, Query(alias="format")] = FileFormat.NDJSON,
+):
+    """Export all users as NDJSON or CSV (Admin only)"""
+    media_type = (
+        "text/csv" if export_format == FileFormat.CSV else "application/x-ndjson"
+    )
+    return StreamingResponse(
+        user_service.export_users(export_format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="users.{export_format}"',
+        },
+    )
+
+
+@router.post(
+    "/import",
+    summary="Import users",
+    description="Register users in bulk from an NDJSON or CSV file with `full_name`, `phone_number`, `password` and optional `is_active` fields. Invalid rows and already registered phone numbers are skipped and listed in the report. Files over the configured size or row count are rejected. This endpoint is restricted to administrators only.",
+    response_model=UserImportReport,
+    dependencies=[Depends(get_current_auth_admin)],
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Users imported successfully",
+            "model": UserImportReport,
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Invalid import file",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "Import file must be UTF-8 encoded",
+                        "details": None,
+                    }
+                }
+            },
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Authentication required",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "Invalid token",
+                        "details": None,
+                    }
+                }
+            },
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Admin privileges required",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "You are not authorized to perform this action",
+                        "details": None,
+                    }
+                }
+            },
+        },
+        status.HTTP_413_REQUEST_ENTITY_TOO_LARGE: {
+            "description": "Import file too large",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "message": "Import file has more than 10000 rows",
+                        "details": None,
+                    }
+                }
+            },
+        },
+    },
+)
+async def import_users(
+    file: UploadFile,
+    user_service: UserServiceTxDep,
+    import_format: Annotated[FileFormat, Query(alias="format")] = FileFormat.NDJSON,
 ):
-    """Get all users in the system (Admin only)"""
-    return await user_service.get_all_users()
+    """Import users from an NDJSON or CSV file (Admin only)"""
+    max_size = settings.user_import.max_file_size
+    # reads at most one byte past the limit, whatever size the client claims
+    content = await file.read(max_size + 1)
+    if len(content) > max_size:
+        raise PayloadTooLargeError(
+            message=f"Import file is larger than {max_size} bytes",
+        )
+    return await user_service.import_users(content, import_format)
 
 
 @router.get(
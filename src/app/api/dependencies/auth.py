@@ -6,15 +6,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies.user import UserServiceDep
 from app.auth.helpers import ACCESS_TOKEN_TYPE
+from app.auth.principal import get_principal_from_payload
 from app.auth.validation import (
     get_current_token_payload_from_header,
     validate_token_type,
 )
+from app.cache import user_cache
 from app.db.session_dep import SessionDep, TransactionSessionDep
 from app.models.user import User
 from app.repositories.user import UserRepository
 from app.schemas.user import UserRead
 from app.services.auth import AuthService
+from core.config import settings
 from core.enums.roles import RolesEnum
 from core.exceptions import AuthenticationError, PermissionDeniedError
 
@@ -24,7 +27,7 @@ http_bearer = HTTPBearer(auto_error=False)
 async def get_auth_service(
     session: Annotated[AsyncSession, SessionDep],
 ) -> AuthService:
-    user_repo = UserRepository(session, User)
+    user_repo = UserRepository(session, User, cache=user_cache)
     return AuthService(
         session=session,
         user_repo=user_repo,
@@ -34,7 +37,7 @@ async def get_auth_service(
 async def get_auth_service_tx(
     session: Annotated[AsyncSession, TransactionSessionDep],
 ) -> AuthService:
-    user_repo = UserRepository(session, User)
+    user_repo = UserRepository(session, User, cache=user_cache)
     return AuthService(
         session=session,
         user_repo=user_repo,
@@ -56,6 +59,10 @@ def get_auth_user_from_token_type(token_type: str) -> Callable:
             raise AuthenticationError(
                 message="Invalid token (subject not found)",
             )
+        if settings.security.stateless_principal:
+            principal = await get_principal_from_payload(payload)
+            if principal is not None:
+                return principal
         user = await user_service.get_by_id(int(subject_id))
         if user:
             return user
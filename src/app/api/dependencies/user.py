@@ -5,6 +5,7 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import user_cache
 from app.db.session_dep import SessionDep, TransactionSessionDep
 from app.models.user import User
 from app.repositories.user import UserRepository
@@ -14,14 +15,14 @@ from app.services.user import UserService
 async def get_user_service(
     session: Annotated[AsyncSession, SessionDep],
 ) -> UserService:
-    repo = UserRepository(session, User)
+    repo = UserRepository(session, User, cache=user_cache)
     return UserService(session, repo)
 
 
 async def get_user_service_tx(
     session: Annotated[AsyncSession, TransactionSessionDep],
 ) -> UserService:
-    repo = UserRepository(session, User)
+    repo = UserRepository(session, User, cache=user_cache)
     return UserService(session, repo)
 
 
@@ -3,15 +3,23 @@ from typing import AsyncGenerator
 
 from fastapi import FastAPI
 
+from app.auth.password_hasher import password_hasher
+from app.cache import invalidation_bus
 from app.clients.redis import redis_client
 from app.db.db_helper import db_helper
+from app.db.replica_router import replica_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # startup
     await redis_client.init()
+    await invalidation_bus.start()
+    await replica_router.start()
     yield
     # shutdown
+    await invalidation_bus.stop()
+    await replica_router.stop()
     await db_helper.dispose()
     await redis_client.close()
+    password_hasher.close()
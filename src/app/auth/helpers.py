@@ -6,6 +6,8 @@ from core.config import settings
 TOKEN_TYPE_FIELD = "type"
 ACCESS_TOKEN_TYPE = "access"
 REFRESH_TOKEN_TYPE = "refresh"
+# refresh token family, see `RefreshTokenStore`
+FAMILY_ID_FIELD = "fid"
 
 
 def create_jwt(
@@ -26,11 +28,14 @@ def create_jwt(
 def create_access_token(
     subject: str,
     role: str,
+    claims: dict | None = None,
 ) -> str:
     jwt_payload = {
         "sub": subject,
         "role": role,
     }
+    if claims:
+        jwt_payload.update(claims)
     return create_jwt(
         token_type=ACCESS_TOKEN_TYPE,
         token_data=jwt_payload,
@@ -41,10 +46,14 @@ def create_access_token(
 def create_refresh_token(
     subject: str,
     role: str,
+    family_id: str,
+    token_id: str,
 ) -> str:
     jwt_payload = {
         "sub": subject,
         "role": role,
+        FAMILY_ID_FIELD: family_id,
+        "jti": token_id,
     }
     return create_jwt(
         token_type=REFRESH_TOKEN_TYPE,
@@ -0,0 +1,162 @@
+import base64
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+from jwt import InvalidTokenError
+from jwt.algorithms import get_default_algorithms
+
+from core.config import settings
+
+log = logging.getLogger(__name__)
+
+# JWK members hashed by RFC 7638, per key type
+THUMBPRINT_MEMBERS = {
+    "RSA": ("e", "kty", "n"),
+    "EC": ("crv", "kty", "x", "y"),
+    "OKP": ("crv", "kty", "x"),
+    "oct": ("k", "kty"),
+}
+
+
+class JWTKeyManager:
+    """
+    Keeps parsed JWT keys in memory, so PyJWT does not re-parse PEM text
+    on every encode/decode.
+
+    Tokens are signed with the current private key and carry its `kid`,
+    the RFC 7638 thumbprint of the public key. Public keys of rotated-out
+    key pairs stay available for verification until the tokens signed with
+    them expire. Key files are re-read when their modification time changes,
+    checked at most every `reload_interval` seconds (0 disables reloading);
+    a key replaced by a reload is kept for verification until restart.
+
+    `key_id` is an alias of the key loaded at startup, accepted for tokens
+    issued before kids were derived from the key.
+    """
+
+    def __init__(
+        self,
+        private_key_path: Path,
+        public_key_path: Path,
+        algorithm: str,
+        key_id: str,
+        previous_public_keys: dict[str, Path] | None = None,
+        reload_interval: int = 30,
+    ) -> None:
+        self.private_key_path = private_key_path
+        self.public_key_path = public_key_path
+        self.key_id = key_id
+        self.previous_public_keys = previous_public_keys or {}
+        self.reload_interval = reload_interval
+        self._algorithm = get_default_algorithms()[algorithm]
+        self._private_key: Any = None
+        self._public_keys: dict[str, Any] = {}
+        self._active_kid: str | None = None
+        self._active: dict[str, Any] = {}
+        self._retired: dict[str, Any] = {}
+        self._mtimes: dict[Path, float] = {}
+        self._checked_at = 0.0
+
+    def _watched_paths(self) -> list[Path]:
+        return [
+            self.private_key_path,
+            self.public_key_path,
+            *self.previous_public_keys.values(),
+        ]
+
+    def _thumbprint(self, public_key: Any) -> str:
+        jwk = self._algorithm.to_jwk(public_key, as_dict=True)
+        members = {name: jwk[name] for name in THUMBPRINT_MEMBERS[jwk["kty"]]}
+        digest = hashlib.sha256(
+            json.dumps(members, sort_keys=True, separators=(",", ":")).encode()
+        ).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    def _load(self) -> None:
+        private_key = self._algorithm.prepare_key(self.private_key_path.read_text())
+        public_key = self._algorithm.prepare_key(self.public_key_path.read_text())
+        kid = self._thumbprint(public_key)
+        if self._active_kid is None:
+            active = {self.key_id: public_key, kid: public_key}
+        elif kid != self._active_kid:
+            # tokens signed with the replaced key are still valid
+            log.warning(
+                "JWT signing key changed, kid %s -> %s, the previous key is kept "
+                "for verification until restart",
+                self._active_kid,
+                kid,
+            )
+            self._retired.update(self._active)
+            active = {kid: public_key}
+        else:
+            active = self._active
+        for active_kid in active:
+            self._retired.pop(active_kid, None)
+        public_keys = {
+            kid: self._algorithm.prepare_key(path.read_text())
+            for kid, path in self.previous_public_keys.items()
+        }
+        public_keys.update(self._retired)
+        public_keys.update(active)
+        self._private_key = private_key
+        self._active_kid = kid
+        self._active = active
+        self._public_keys = public_keys
+        self._mtimes = {path: path.stat().st_mtime for path in self._watched_paths()}
+        log.info("JWT keys loaded, active kid: %s", kid)
+
+    def _ensure_loaded(self) -> None:
+        if self._private_key is None:
+            self._load()
+            self._checked_at = time.monotonic()
+            return
+        if not self.reload_interval:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+        try:
+            changed = any(
+                path.stat().st_mtime != self._mtimes.get(path)
+                for path in self._watched_paths()
+            )
+            if changed:
+                self._load()
+        except (OSError, ValueError) as e:
+            # keep serving with the keys we already have
+            log.error("Failed to reload JWT keys: %s", e)
+
+    @property
+    def signing_key(self) -> tuple[str, Any]:
+        """Return `(kid, private_key)` used to sign new tokens."""
+        self._ensure_loaded()
+        return self._active_kid, self._private_key
+
+    @property
+    def has_multiple_keys(self) -> bool:
+        """Whether tokens may be signed with a key other than the active one."""
+        self._ensure_loaded()
+        return len(self._public_keys) > len(self._active)
+
+    def get_verification_key(self, kid: str | None) -> Any:
+        """Return the public key for `kid`, tokens without `kid` use the active key."""
+        self._ensure_loaded()
+        key = self._public_keys.get(kid or self._active_kid)
+        if key is None:
+            raise InvalidTokenError(f"Unknown key id {kid!r}")
+        return key
+
+
+key_manager = JWTKeyManager(
+    private_key_path=settings.security.private_key_path,
+    public_key_path=settings.security.public_key_path,
+    algorithm=settings.security.algorithm,
+    key_id=settings.security.key_id,
+    previous_public_keys=settings.security.previous_public_keys,
+    reload_interval=settings.security.key_reload_interval,
+)
@@ -0,0 +1,230 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+from app.clients.redis import RedisClient, redis_client
+from core.config import settings
+from core.exceptions import RateLimitError
+
+log = logging.getLogger(__name__)
+
+# For every subject i (phone number, client IP):
+# KEYS[3i+1] - attempts counter, KEYS[3i+2] - lockouts counter, KEYS[3i+3] - lock
+# ARGV[1] - attempts window ms, ARGV[2] - first lockout ms, ARGV[3] - max lockout ms,
+# ARGV[4 + i] - attempts allowed for the subject
+# Counts the attempt for every subject, unless one of them is locked or would
+# exceed its allowance: then nothing is counted and the exceeding subjects
+# are locked out. Returns the lock of every subject in ms, 0 if none
+RESERVE_ATTEMPT_SCRIPT = """
+local window = tonumber(ARGV[1])
+local base_lockout = tonumber(ARGV[2])
+local max_lockout = tonumber(ARGV[3])
+local subjects = #KEYS / 3
+local locks = {}
+local attempts = {}
+local rejected = false
+for i = 0, subjects - 1 do
+    local ttl = redis.call('PTTL', KEYS[3 * i + 3])
+    locks[i + 1] = math.max(ttl, 0)
+    attempts[i + 1] = tonumber(redis.call('GET', KEYS[3 * i + 1]) or '0') + 1
+    if ttl > 0 or attempts[i + 1] > tonumber(ARGV[4 + i]) then
+        rejected = true
+    end
+end
+for i = 0, subjects - 1 do
+    local attempts_key = KEYS[3 * i + 1]
+    if locks[i + 1] == 0 and attempts[i + 1] > tonumber(ARGV[4 + i]) then
+        -- every lockout in a row doubles the next one
+        local lockouts = redis.call('INCR', KEYS[3 * i + 2])
+        redis.call('PEXPIRE', KEYS[3 * i + 2], max_lockout * 2)
+        local lockout = math.min(base_lockout * 2 ^ (lockouts - 1), max_lockout)
+        redis.call('SET', KEYS[3 * i + 3], 1, 'PX', lockout)
+        redis.call('DEL', attempts_key)
+        locks[i + 1] = lockout
+    elseif not rejected then
+        if redis.call('INCR', attempts_key) == 1 then
+            redis.call('PEXPIRE', attempts_key, window)
+        end
+    end
+end
+return locks
+"""
+
+# KEYS[1] - attempts counter of the phone, KEYS[2] - its lockouts counter,
+# KEYS[3] - attempts counter of the IP, if any
+# Forgets the phone's attempts, the successful attempt no longer counts for the IP
+RESET_SCRIPT = """
+redis.call('DEL', KEYS[1], KEYS[2])
+if KEYS[3] and tonumber(redis.call('GET', KEYS[3]) or '0') > 0 then
+    redis.call('DECR', KEYS[3])
+end
+"""
+
+
+class LoginThrottle:
+    """
+    Login attempt counters per phone number and per client IP.
+
+    Every attempt is counted before the user lookup and password
+    verification, so a burst of concurrent attempts can not all pass while
+    bcrypt runs; a successful login takes its attempt back. An attempt
+    beyond the allowed failures within `failure_window` seconds locks the
+    phone number or IP out, for `base_lockout` seconds first and twice as
+    long after each further lockout, up to `max_lockout`. Known locks are
+    kept in process memory too, so repeated attempts are rejected without Redis.
+    """
+
+    key_prefix = "auth:login:"
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        phone_max_failures: int = 5,
+        ip_max_failures: int = 20,
+        failure_window: int = 900,
+        base_lockout: int = 30,
+        max_lockout: int = 3600,
+        local_max_size: int = 10_000,
+        enabled: bool = True,
+    ) -> None:
+        self.redis = redis
+        self.phone_max_failures = phone_max_failures
+        self.ip_max_failures = ip_max_failures
+        self.failure_window = failure_window
+        self.base_lockout = base_lockout
+        self.max_lockout = max_lockout
+        self.local_max_size = local_max_size
+        self.enabled = enabled
+        self._scripts: dict[str, AsyncScript] = {}
+        self._local_locks: OrderedDict[str, float] = OrderedDict()
+        self._rejected = 0
+
+    def _script(self, source: str) -> AsyncScript:
+        script = self._scripts.get(source)
+        if script is None:
+            script = self._scripts[source] = self.redis.client.register_script(source)
+        return script
+
+    def _subjects(self, phone_number: str, client_ip: str | None) -> list[str]:
+        subjects = [f"phone:{phone_number}"]
+        if client_ip:
+            subjects.append(f"ip:{client_ip}")
+        return subjects
+
+    def _attempts_key(self, subject: str) -> str:
+        return f"{self.key_prefix}failures:{subject}"
+
+    def _lockouts_key(self, subject: str) -> str:
+        return f"{self.key_prefix}lockouts:{subject}"
+
+    def _lock_key(self, subject: str) -> str:
+        return f"{self.key_prefix}lock:{subject}"
+
+    def _lock_locally(self, subject: str, seconds: float) -> None:
+        self._local_locks[subject] = time.monotonic() + seconds
+        self._local_locks.move_to_end(subject)
+        if len(self._local_locks) > self.local_max_size:
+            self._local_locks.popitem(last=False)
+
+    def _reject(self, retry_after: float) -> RateLimitError:
+        self._rejected += 1
+        return RateLimitError(
+            message="Too many failed login attempts, try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+    async def reserve(
+        self,
+        phone_number: str,
+        client_ip: str | None = None,
+    ) -> None:
+        """
+        Count a login attempt of the phone number from the IP, raise
+        `RateLimitError` instead if either is locked out. Call `reset`
+        once the attempt succeeds.
+        """
+        if not self.enabled:
+            return
+        subjects = self._subjects(phone_number, client_ip)
+        now = time.monotonic()
+        for subject in subjects:
+            locked_until = self._local_locks.get(subject)
+            if locked_until is not None:
+                if locked_until > now:
+                    raise self._reject(locked_until - now)
+                del self._local_locks[subject]
+
+        keys = []
+        for subject in subjects:
+            keys += [
+                self._attempts_key(subject),
+                self._lockouts_key(subject),
+                self._lock_key(subject),
+            ]
+        max_failures = [self.phone_max_failures, self.ip_max_failures]
+        try:
+            locks = await self._script(RESERVE_ATTEMPT_SCRIPT)(
+                keys=keys,
+                args=[
+                    self.failure_window * 1000,
+                    self.base_lockout * 1000,
+                    self.max_lockout * 1000,
+                    *max_failures[: len(subjects)],
+                ],
+            )
+        except RedisError as e:
+            log.error("Failed to reserve login attempt: %s", e)
+            return
+        locked = [
+            (subject, lock_ms / 1000)
+            for subject, lock_ms in zip(subjects, locks)
+            if lock_ms > 0
+        ]
+        if locked:
+            for subject, seconds in locked:
+                log.warning("Login locked out for %s (%.1f s)", subject, seconds)
+                self._lock_locally(subject, seconds)
+            raise self._reject(max(seconds for _, seconds in locked))
+
+    async def reset(
+        self,
+        phone_number: str,
+        client_ip: str | None = None,
+    ) -> None:
+        """
+        Forget attempts of the phone number after a successful login,
+        the IP only gets the reserved attempt back.
+        """
+        if not self.enabled:
+            return
+        subject = f"phone:{phone_number}"
+        keys = [self._attempts_key(subject), self._lockouts_key(subject)]
+        if client_ip:
+            keys.append(self._attempts_key(f"ip:{client_ip}"))
+        try:
+            await self._script(RESET_SCRIPT)(keys=keys)
+        except RedisError as e:
+            log.error("Failed to reset login attempts: %s", e)
+
+    def stats(self) -> dict[str, int | bool]:
+        return {
+            "enabled": self.enabled,
+            "local_locks": len(self._local_locks),
+            "rejected": self._rejected,
+        }
+
+
+login_throttle = LoginThrottle(
+    redis_client,
+    phone_max_failures=settings.login_throttle.phone_max_failures,
+    ip_max_failures=settings.login_throttle.ip_max_failures,
+    failure_window=settings.login_throttle.failure_window,
+    base_lockout=settings.login_throttle.base_lockout,
+    max_lockout=settings.login_throttle.max_lockout,
+    local_max_size=settings.login_throttle.local_max_size,
+    enabled=settings.login_throttle.enabled,
+)
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Literal, Sequence
+
+from app.auth import utils as auth_utils
+from core.config import settings
+from core.exceptions import ServiceUnavailableError
+
+log = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification in a bounded executor,
+    so that the event loop is never blocked by password checks.
+
+    At most `max_workers + max_pending` jobs are accepted at once. Callers
+    beyond that wait up to `acquire_timeout` seconds for a free slot and
+    are rejected with `ServiceUnavailableError` afterwards.
+    """
+
+    def __init__(
+        self,
+        executor: Literal["thread", "process"] = "thread",
+        max_workers: int = 4,
+        max_pending: int = 64,
+        acquire_timeout: float = 5.0,
+    ) -> None:
+        self.executor_type = executor
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_pending
+        self.acquire_timeout = acquire_timeout
+        self._executor: Executor | None = None
+        self._slots = asyncio.Semaphore(self.capacity)
+        self._in_flight = 0
+        self._waiting = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hasher",
+                )
+            log.info(
+                "Password hasher started (%s executor, %s workers)",
+                self.executor_type,
+                self.max_workers,
+            )
+        return self._executor
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(
+                self._slots.acquire(),
+                timeout=self.acquire_timeout,
+            )
+        except TimeoutError:
+            self._rejected += 1
+            log.warning("Password hasher is saturated, rejecting request")
+            raise ServiceUnavailableError(
+                message="Too many authentication requests, try again later",
+            )
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        loop = asyncio.get_running_loop()
+        try:
+            job = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # the slot is freed when the job is done, not when the caller stops
+        # waiting, so cancelled requests do not let extra jobs in
+        job.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        return await asyncio.wrap_future(job)
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._completed += 1
+        self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(auth_utils.hash_password, password)
+
+    async def hash_many(
+        self,
+        passwords: Sequence[str],
+        chunk_size: int = 8,
+    ) -> list[str]:
+        """
+        Hash a batch of passwords, `chunk_size` per executor job.
+
+        At most half of the workers are busy with one batch at a time,
+        so logins keep being served during bulk imports.
+        """
+        chunks = [
+            list(passwords[i : i + chunk_size])
+            for i in range(0, len(passwords), chunk_size)
+        ]
+        concurrency = asyncio.Semaphore(max(1, self.max_workers // 2))
+
+        async def hash_chunk(chunk: list[str]) -> list[str]:
+            async with concurrency:
+                return await self._run(auth_utils.hash_passwords, chunk)
+
+        hashed = await asyncio.gather(*(hash_chunk(chunk) for chunk in chunks))
+        return [password for chunk in hashed for password in chunk]
+
+    async def verify(
+        self,
+        password: str,
+        hashed_password: bytes | str,
+    ) -> bool:
+        return await self._run(
+            auth_utils.validate_password,
+            password,
+            hashed_password,
+        )
+
+    def stats(self) -> dict[str, int | float]:
+        """Snapshot of the executor load, `saturation` is in [0, 1]."""
+        return {
+            "capacity": self.capacity,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "saturation": round(self._in_flight / self.capacity, 3),
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            log.info("Password hasher stopped")
+
+
+password_hasher = PasswordHasher(
+    executor=settings.password_hasher.executor,
+    max_workers=settings.password_hasher.max_workers,
+    max_pending=settings.password_hasher.max_pending,
+    acquire_timeout=settings.password_hasher.acquire_timeout,
+)
@@ -0,0 +1,105 @@
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from redis.exceptions import RedisError
+
+from app.clients.redis import RedisClient, redis_client
+from app.schemas.user import UserRead
+
+if TYPE_CHECKING:
+    from app.models.user import User
+
+log = logging.getLogger(__name__)
+
+PRINCIPAL_VERSION_FIELD = "ver"
+
+
+class PrincipalVersionStore:
+    """
+    Per-user principal version kept in Redis.
+
+    Access tokens issued in stateless mode embed the version current at
+    issue time; bumping it makes those embedded principals stale. Keys are
+    not persisted, a missing one makes every embedded principal of the
+    user stale. Login seeds the key with the current time in ms, so
+    versions started after a lost key never match older ones.
+    """
+
+    key_prefix = "auth:principal_version:"
+
+    def __init__(self, redis: RedisClient) -> None:
+        self.redis = redis
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.key_prefix}{user_id}"
+
+    async def get(self, user_id: int) -> int | None:
+        """The current version, `None` if the key is missing."""
+        version = await self.redis.client.get(self._key(user_id))
+        return int(version) if version is not None else None
+
+    async def ensure(self, user_id: int) -> int:
+        """The current version, seeding a missing key first."""
+        key = self._key(user_id)
+        _, version = await self.redis.execute_many(
+            [
+                ("SET", key, int(time.time() * 1000), "NX"),
+                ("GET", key),
+            ]
+        )
+        return int(version)
+
+    async def bump(self, user_id: int) -> int:
+        return await self.redis.client.incr(self._key(user_id))
+
+    async def bump_many(self, user_ids: list[int]) -> None:
+        if not user_ids:
+            return
+        await self.redis.execute_many(
+            [("INCR", self._key(user_id)) for user_id in user_ids]
+        )
+
+
+principal_versions = PrincipalVersionStore(redis_client)
+
+
+def build_principal_claims(
+    user: "User | UserRead",
+    version: int,
+) -> dict:
+    """Claims needed to rebuild `UserRead` from an access token."""
+    return {
+        "full_name": user.full_name,
+        "phone_number": user.phone_number,
+        "is_active": user.is_active,
+        PRINCIPAL_VERSION_FIELD: version,
+    }
+
+
+async def get_principal_from_payload(payload: dict) -> UserRead | None:
+    """
+    Build the current user from token claims without touching the database.
+
+    Returns `None` when the token carries no principal, the principal is
+    stale, or Redis can not confirm it, so the caller falls back to a lookup.
+    """
+    version = payload.get(PRINCIPAL_VERSION_FIELD)
+    if version is None:
+        return None
+    user_id = int(payload["sub"])
+    try:
+        current_version = await principal_versions.get(user_id)
+    except RedisError as e:
+        log.warning("Failed to check principal version of user %s: %s", user_id, e)
+        return None
+    # a missing key (None) never matches
+    if current_version != version:
+        return None
+    return UserRead(
+        id=user_id,
+        full_name=payload["full_name"],
+        phone_number=payload["phone_number"],
+        is_active=payload["is_active"],
+        role=payload["role"],
+    )
@@ -0,0 +1,224 @@
+import logging
+import uuid
+from typing import TYPE_CHECKING, NamedTuple
+
+import orjson
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+from app.auth.principal import build_principal_claims
+from app.clients.redis import RedisClient, redis_client
+from app.schemas.user import UserRead
+from core.config import settings
+from core.exceptions import AuthenticationError, ServiceUnavailableError
+
+if TYPE_CHECKING:
+    from app.models.user import User
+
+log = logging.getLogger(__name__)
+
+# KEYS[1] - family hash, KEYS[2] - family ids of the user
+# ARGV[1] - presented jti, ARGV[2] - new jti, ARGV[3] - family ttl ms, ARGV[4] - user id
+# Returns {1, role, principal} on rotation, {0} for an unknown family,
+# {-1} when a rotated-out token is reused and the family gets revoked
+ROTATE_SCRIPT = """
+local family = redis.call('HMGET', KEYS[1], 'jti', 'uid', 'role', 'principal')
+if not family[1] or family[2] ~= ARGV[4] then
+    return {0}
+end
+if family[1] == ARGV[2] then
+    -- the same call replayed after it ran, e.g. on a lost reply
+    return {1, family[3], family[4]}
+end
+if family[1] ~= ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    redis.call('SREM', KEYS[2], KEYS[1])
+    return {-1}
+end
+redis.call('HSET', KEYS[1], 'jti', ARGV[2])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+-- the index outlives every family of the user
+redis.call('PEXPIRE', KEYS[2], ARGV[3])
+return {1, family[3], family[4]}
+"""
+
+# KEYS - family ids of every user, families are the members of the sets
+# Returns the number of revoked families
+REVOKE_SCRIPT = """
+local revoked = 0
+for _, user_key in ipairs(KEYS) do
+    local families = redis.call('SMEMBERS', user_key)
+    for _, family_key in ipairs(families) do
+        revoked = revoked + redis.call('DEL', family_key)
+    end
+    redis.call('DEL', user_key)
+end
+return revoked
+"""
+
+# KEYS[1] - family ids of the user, ARGV[1] - role, ARGV[2] - principal
+# Returns the number of updated families
+UPDATE_SCRIPT = """
+local updated = 0
+for _, family_key in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    if redis.call('EXISTS', family_key) == 1 then
+        redis.call('HSET', family_key, 'role', ARGV[1], 'principal', ARGV[2])
+        updated = updated + 1
+    else
+        redis.call('SREM', KEYS[1], family_key)
+    end
+end
+return updated
+"""
+
+
+class RefreshTokenFamily(NamedTuple):
+    family_id: str
+    token_id: str
+
+
+class RotatedFamily(NamedTuple):
+    token_id: str
+    role: str
+    # principal claims of the user, see `build_principal_claims`
+    principal: dict
+
+
+class RefreshTokenStore:
+    """
+    Refresh token families kept in Redis.
+
+    Login starts a family holding the `jti` of its only valid refresh
+    token and what is needed to issue access tokens. Every refresh swaps
+    the `jti` in one script call, so refreshing never touches the database.
+    Presenting a rotated-out token means it was stolen or replayed: the
+    whole family is revoked. Families of a user are indexed, so they can
+    all be revoked at once, e.g. when the user is deleted.
+
+    Scripts reach families through the user index rather than declared
+    keys, so the store expects a single Redis instance, not a cluster.
+    """
+
+    key_prefix = "auth:refresh:"
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        ttl: int = 30 * 24 * 3600,
+    ) -> None:
+        self.redis = redis
+        self.ttl = ttl
+        self._scripts: dict[str, AsyncScript] = {}
+        self._rotated = 0
+        self._reused = 0
+
+    def _script(self, source: str) -> AsyncScript:
+        script = self._scripts.get(source)
+        if script is None:
+            script = self._scripts[source] = self.redis.client.register_script(source)
+        return script
+
+    def _family_key(self, family_id: str) -> str:
+        return f"{self.key_prefix}family:{family_id}"
+
+    def _user_key(self, user_id: int) -> str:
+        return f"{self.key_prefix}user:{user_id}"
+
+    async def create(
+        self,
+        user: "User | UserRead",
+        version: int,
+    ) -> RefreshTokenFamily:
+        family = RefreshTokenFamily(str(uuid.uuid4()), str(uuid.uuid4()))
+        family_key = self._family_key(family.family_id)
+        user_key = self._user_key(user.id)
+        try:
+            async with self.redis.client.pipeline(transaction=True) as pipe:
+                pipe.hset(
+                    family_key,
+                    mapping={
+                        "jti": family.token_id,
+                        "uid": str(user.id),
+                        "role": user.role,
+                        "principal": orjson.dumps(
+                            build_principal_claims(user, version)
+                        ),
+                    },
+                )
+                pipe.expire(family_key, self.ttl)
+                pipe.sadd(user_key, family_key)
+                pipe.expire(user_key, self.ttl)
+                await pipe.execute()
+        except RedisError as e:
+            log.error("Failed to store refresh token family: %s", e)
+            raise ServiceUnavailableError(message="Login is temporarily unavailable")
+        return family
+
+    async def rotate(
+        self,
+        user_id: int,
+        family_id: str,
+        token_id: str,
+    ) -> RotatedFamily:
+        """Swap the family's `jti` for a new one, raise if `token_id` is not current."""
+        new_token_id = str(uuid.uuid4())
+        try:
+            result = await self._script(ROTATE_SCRIPT)(
+                keys=[self._family_key(family_id), self._user_key(user_id)],
+                args=[token_id, new_token_id, self.ttl * 1000, user_id],
+            )
+        except RedisError as e:
+            log.error("Failed to rotate refresh token: %s", e)
+            raise ServiceUnavailableError(
+                message="Token refresh is temporarily unavailable"
+            )
+        if result[0] == -1:
+            self._reused += 1
+            log.warning(
+                "Refresh token reuse detected for user %s, family %s revoked",
+                user_id,
+                family_id,
+            )
+        if result[0] != 1:
+            raise AuthenticationError(message="Invalid token (revoked)")
+        self._rotated += 1
+        _, role, principal = result
+        return RotatedFamily(new_token_id, role.decode(), orjson.loads(principal))
+
+    async def update_user(
+        self,
+        user: "User | UserRead",
+        version: int,
+    ) -> None:
+        """Refresh the principal stored in all families of the user."""
+        try:
+            await self._script(UPDATE_SCRIPT)(
+                keys=[self._user_key(user.id)],
+                args=[user.role, orjson.dumps(build_principal_claims(user, version))],
+            )
+        except RedisError as e:
+            log.error("Failed to update refresh tokens of user %s: %s", user.id, e)
+
+    async def revoke_users(self, user_ids: list[int]) -> int:
+        """Revoke all refresh token families of the users."""
+        if not user_ids:
+            return 0
+        try:
+            return await self._script(REVOKE_SCRIPT)(
+                keys=[self._user_key(user_id) for user_id in user_ids],
+            )
+        except RedisError as e:
+            log.error("Failed to revoke refresh tokens of %s: %s", user_ids, e)
+            return 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "rotated": self._rotated,
+            "reused": self._reused,
+        }
+
+
+refresh_tokens = RefreshTokenStore(
+    redis_client,
+    ttl=settings.security.refresh_token_expire_days * 24 * 3600,
+)
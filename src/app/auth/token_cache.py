@@ -0,0 +1,76 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+from core.config import settings
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of already verified token payloads.
+
+    Entries are keyed by the SHA-256 digest of the token and are served
+    until the token's `exp`, so a token re-sent during its lifetime skips
+    signature verification. Disable it when every request must be verified
+    against the current keys.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        enabled: bool = True,
+    ) -> None:
+        self.max_size = max_size
+        self.enabled = enabled
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict | None:
+        if not self.enabled:
+            return None
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        # callers get their own copy, claims are flat so a shallow one is enough
+        return dict(payload)
+
+    def set(self, token: str, payload: dict) -> None:
+        expires_at = payload.get("exp")
+        if not self.enabled or expires_at is None:
+            return
+        key = self._key(token)
+        self._entries[key] = (float(expires_at), dict(payload))
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int | bool]:
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+
+token_cache = VerifiedTokenCache(
+    max_size=settings.security.token_cache_max_size,
+    enabled=settings.security.token_cache_enabled,
+)
@@ -1,19 +1,25 @@
 import uuid
 from datetime import UTC, datetime, timedelta
+from typing import Any
 
 import bcrypt
 import jwt
 
+from app.auth.keys import key_manager
 from core.config import settings
 
 
 def encode_jwt(
     payload: dict,
-    private_key: str = settings.security.private_key_path.read_text(),
+    private_key: Any | None = None,
     algorithm: str = settings.security.algorithm,
     expire_minutes: int = settings.security.access_token_expire_minutes,
     expire_timedelta: timedelta | None = None,
 ) -> str:
+    headers = None
+    if private_key is None:
+        key_id, private_key = key_manager.signing_key
+        headers = {"kid": key_id}
     to_encode = payload.copy()
     now = datetime.now(UTC)
     if expire_timedelta:
@@ -23,21 +29,28 @@ def encode_jwt(
     to_encode.update(
         exp=expire,
         iat=now,
-        jti=str(uuid.uuid4()),
+        jti=to_encode.get("jti") or str(uuid.uuid4()),
     )
     encoded = jwt.encode(
         to_encode,
         private_key,
         algorithm=algorithm,
+        headers=headers,
     )
     return encoded
 
 
 def decode_jwt(
     token: str | bytes,
-    public_key: str = settings.security.public_key_path.read_text(),
+    public_key: Any | None = None,
     algorithm: str = settings.security.algorithm,
 ) -> dict:
+    if public_key is None:
+        key_id = None
+        if key_manager.has_multiple_keys:
+            # header is only worth parsing when there is more than one key
+            key_id = jwt.get_unverified_header(token).get("kid")
+        public_key = key_manager.get_verification_key(key_id)
     decoded = jwt.decode(
         token,
         public_key,
@@ -55,6 +68,12 @@ def hash_password(
     return hashed_password.decode("utf-8")
 
 
+def hash_passwords(
+    passwords: list[str],
+) -> list[str]:
+    return [hash_password(password) for password in passwords]
+
+
 def validate_password(
     password: str,
     hashed_password: bytes | str,
@@ -1,8 +1,9 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jwt import InvalidTokenError
 
 from app.auth import utils as auth_utils
+from app.auth.token_cache import token_cache
 
 from .helpers import TOKEN_TYPE_FIELD
 
@@ -29,7 +30,31 @@ def get_current_token_payload_from_header(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
-    return get_token_payload(token=token)
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = get_token_payload(token=token)
+        token_cache.set(token, payload)
+    return payload
+
+
+def get_request_principal(request: Request) -> str:
+    """
+    `user:<id>` for a request with a valid bearer token,
+    `ip:<client address>` otherwise.
+    """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        payload = token_cache.get(token)
+        if payload is None:
+            try:
+                payload = auth_utils.decode_jwt(token=token)
+            except InvalidTokenError:
+                payload = None
+            else:
+                token_cache.set(token, payload)
+        if payload and payload.get("sub") is not None:
+            return f"user:{payload['sub']}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
 
 
 def validate_token_type(
@@ -0,0 +1,18 @@
+__all__ = (
+    "MISSING",
+    "CacheBackend",
+    "CacheInvalidationBus",
+    "LocalCache",
+    "RedisCache",
+    "TieredCache",
+    "UserCache",
+    "invalidation_bus",
+    "user_cache",
+)
+
+from .base import MISSING, CacheBackend
+from .invalidation import CacheInvalidationBus, invalidation_bus
+from .local_cache import LocalCache
+from .redis_cache import RedisCache
+from .tiered_cache import TieredCache
+from .user import UserCache, user_cache
@@ -0,0 +1,30 @@
+from typing import Any, Final, Iterable, Protocol
+
+MISSING: Final = object()
+
+
+class CacheBackend(Protocol):
+    """Key/value cache of JSON-compatible values, `MISSING` marks absent keys."""
+
+    prefix: str
+
+    async def get(self, key: str) -> Any: ...
+
+    async def get_many(self, keys: list[str]) -> list[Any]: ...
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int | None = None,
+    ) -> None: ...
+
+    async def set_many(
+        self,
+        items: dict[str, Any],
+        ttl: int | None = None,
+    ) -> None: ...
+
+    async def delete(self, keys: Iterable[str]) -> None: ...
+
+    def stats(self) -> dict[str, int | bool]: ...
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+
+import orjson
+from redis.exceptions import RedisError
+
+from app.clients.redis import RedisClient, redis_client
+from core.config import settings
+
+from .local_cache import LocalCache
+
+log = logging.getLogger(__name__)
+
+
+class CacheInvalidationBus:
+    """
+    Broadcasts deleted cache keys over Redis pub/sub, so every worker
+    process drops them from its in-process caches.
+
+    While the subscription is down, `is_listening` is `False` and tiered
+    caches bypass their local tier. Local caches are cleared on every
+    (re)subscribe, since invalidations may have been missed meanwhile.
+    """
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        channel: str,
+        reconnect_delay: float = 1.0,
+        poll_timeout: float = 1.0,
+    ) -> None:
+        self.redis = redis
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.poll_timeout = poll_timeout
+        self.is_listening = False
+        self._local_caches: dict[str, LocalCache] = {}
+        self._task: asyncio.Task | None = None
+
+    def register(self, prefix: str, local: LocalCache) -> None:
+        self._local_caches[prefix] = local
+
+    async def publish(self, prefix: str, keys: list[str]) -> None:
+        message = orjson.dumps({"prefix": prefix, "keys": keys})
+        try:
+            await self.redis.client.publish(self.channel, message)
+        except RedisError as e:
+            log.error("Failed to publish cache invalidation: %s", e)
+
+    def _clear_all(self) -> None:
+        for local in self._local_caches.values():
+            local.clear()
+
+    def _apply(self, data: bytes) -> None:
+        try:
+            message = orjson.loads(data)
+            local = self._local_caches.get(message["prefix"])
+            if local is not None:
+                local.delete(message["keys"])
+        except Exception:
+            # a bad message must not stop the listener
+            log.exception("Malformed cache invalidation message: %r", data)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.redis.client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    self._clear_all()
+                    self.is_listening = True
+                    log.info("Listening for cache invalidations on %r", self.channel)
+                    while True:
+                        # polled with a timeout, so a quiet channel does not
+                        # hit the client socket timeout and health checks run
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True,
+                            timeout=self.poll_timeout,
+                        )
+                        if message is not None and message["type"] == "message":
+                            self._apply(message["data"])
+            except RedisError as e:
+                log.warning("Cache invalidation subscription lost: %s", e)
+            finally:
+                self.is_listening = False
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+invalidation_bus = CacheInvalidationBus(
+    redis=redis_client,
+    channel=settings.cache.invalidation_channel,
+)
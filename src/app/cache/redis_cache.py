@@ -0,0 +1,79 @@
+import logging
+from typing import Any, Iterable
+
+import orjson
+from redis.exceptions import RedisError
+
+from app.clients.redis import RedisClient
+
+from .base import MISSING
+
+log = logging.getLogger(__name__)
+
+
+class RedisCache:
+    """
+    JSON values stored in Redis under a common key prefix.
+
+    Redis errors never reach the caller: reads degrade to `MISSING`
+    and writes are skipped, so the database stays the source of truth.
+    """
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        prefix: str,
+        ttl: int,
+    ) -> None:
+        self.redis = redis
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def get(self, key: str) -> Any:
+        """Return the cached value or `MISSING`, `None` is a valid cached value."""
+        return (await self.get_many([key]))[0]
+
+    async def get_many(self, keys: list[str]) -> list[Any]:
+        if not keys:
+            return []
+        try:
+            raw_values = await self.redis.mget([self._key(k) for k in keys])
+        except RedisError as e:
+            log.warning("Cache read from %r failed: %s", self.prefix, e)
+            return [MISSING] * len(keys)
+        return [MISSING if raw is None else orjson.loads(raw) for raw in raw_values]
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int | None = None,
+    ) -> None:
+        await self.set_many({key: value}, ttl=ttl)
+
+    async def set_many(
+        self,
+        items: dict[str, Any],
+        ttl: int | None = None,
+    ) -> None:
+        if not items:
+            return
+        try:
+            await self.redis.set_many(
+                {self._key(key): orjson.dumps(value) for key, value in items.items()},
+                ex=ttl or self.ttl,
+            )
+        except RedisError as e:
+            log.warning("Cache write to %r failed: %s", self.prefix, e)
+
+    async def delete(self, keys: Iterable[str]) -> None:
+        try:
+            await self.redis.delete_many(self._key(k) for k in keys)
+        except RedisError as e:
+            log.error("Cache invalidation in %r failed: %s", self.prefix, e)
+
+    def stats(self) -> dict[str, int | bool]:
+        return {}
@@ -0,0 +1,80 @@
+from typing import Any, Iterable
+
+from .base import MISSING
+from .invalidation import CacheInvalidationBus
+from .local_cache import LocalCache
+from .redis_cache import RedisCache
+
+
+class TieredCache:
+    """
+    Per-process `LocalCache` in front of a shared `RedisCache`.
+
+    Reads are served from memory when possible, deletes are applied to
+    both tiers and broadcast to the other workers through the bus.
+    """
+
+    def __init__(
+        self,
+        remote: RedisCache,
+        local: LocalCache,
+        bus: CacheInvalidationBus,
+    ) -> None:
+        self.remote = remote
+        self.local = local
+        self.bus = bus
+        self.prefix = remote.prefix
+        bus.register(self.prefix, local)
+
+    async def get(self, key: str) -> Any:
+        return (await self.get_many([key]))[0]
+
+    async def get_many(self, keys: list[str]) -> list[Any]:
+        if not self.bus.is_listening:
+            return await self.remote.get_many(keys)
+        values = [self.local.get(key) for key in keys]
+        missed = [key for key, value in zip(keys, values) if value is MISSING]
+        if not missed:
+            return values
+        fetched = dict(zip(missed, await self.remote.get_many(missed)))
+        for key, value in fetched.items():
+            if value is not MISSING:
+                self.local.set(key, value)
+        return [
+            fetched[key] if value is MISSING else value
+            for key, value in zip(keys, values)
+        ]
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int | None = None,
+    ) -> None:
+        await self.set_many({key: value}, ttl=ttl)
+
+    async def set_many(
+        self,
+        items: dict[str, Any],
+        ttl: int | None = None,
+    ) -> None:
+        if self.bus.is_listening:
+            for key, value in items.items():
+                self.local.set(key, value, ttl=ttl)
+        await self.remote.set_many(items, ttl=ttl)
+
+    async def delete(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if not keys:
+            return
+        self.local.delete(keys)
+        await self.remote.delete(keys)
+        await self.bus.publish(self.prefix, keys)
+
+    def stats(self) -> dict[str, int | bool]:
+        return {
+            "local_size": len(self.local),
+            "local_hits": self.local.hits,
+            "local_misses": self.local.misses,
+            "listening": self.bus.is_listening,
+        }
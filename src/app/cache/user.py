@@ -0,0 +1,112 @@
+from typing import Any, Iterable
+
+from app.clients.redis import redis_client
+from app.schemas.user import UserRead
+from core.config import settings
+
+from .base import MISSING, CacheBackend
+from .invalidation import invalidation_bus
+from .local_cache import LocalCache
+from .redis_cache import RedisCache
+from .tiered_cache import TieredCache
+
+
+class UserCache:
+    """
+    `UserRead` payloads cached by user id and by phone number.
+
+    Unknown phone numbers are cached as `None` for `negative_ttl` seconds,
+    so repeated logins with a wrong phone do not reach the database.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        negative_ttl: int,
+        enabled: bool = True,
+    ) -> None:
+        self.backend = backend
+        self.negative_ttl = negative_ttl
+        self.enabled = enabled
+
+    @staticmethod
+    def _id_key(user_id: int) -> str:
+        return f"id:{user_id}"
+
+    @staticmethod
+    def _phone_key(phone_number: str) -> str:
+        return f"phone:{phone_number}"
+
+    async def get_by_id(self, user_id: int) -> Any:
+        """Return `UserRead` or `MISSING`."""
+        if not self.enabled:
+            return MISSING
+        cached = await self.backend.get(self._id_key(user_id))
+        if cached is MISSING or cached is None:
+            return MISSING
+        return UserRead.model_validate(cached)
+
+    async def get_by_phone(self, phone_number: str) -> Any:
+        """Return `UserRead`, `None` for a known unknown phone, or `MISSING`."""
+        if not self.enabled:
+            return MISSING
+        cached = await self.backend.get(self._phone_key(phone_number))
+        if cached is MISSING or cached is None:
+            return cached
+        return UserRead.model_validate(cached)
+
+    async def set(self, user: UserRead) -> None:
+        if not self.enabled:
+            return
+        payload = user.model_dump(mode="json")
+        await self.backend.set_many(
+            {
+                self._id_key(user.id): payload,
+                self._phone_key(user.phone_number): payload,
+            }
+        )
+
+    async def set_missing_phone(self, phone_number: str) -> None:
+        if not self.enabled:
+            return
+        await self.backend.set(
+            self._phone_key(phone_number),
+            None,
+            ttl=self.negative_ttl,
+        )
+
+    async def invalidate(
+        self,
+        user_ids: Iterable[int] = (),
+        phone_numbers: Iterable[str] = (),
+    ) -> None:
+        if not self.enabled:
+            return
+        id_keys = [self._id_key(user_id) for user_id in user_ids]
+        keys = [*id_keys, *(self._phone_key(p) for p in phone_numbers)]
+        # phone entries of the invalidated ids are found through their payloads
+        for cached in await self.backend.get_many(id_keys):
+            if isinstance(cached, dict):
+                keys.append(self._phone_key(cached["phone_number"]))
+        await self.backend.delete(keys)
+
+    def stats(self) -> dict[str, int | bool]:
+        return {"enabled": self.enabled, **self.backend.stats()}
+
+
+user_cache = UserCache(
+    backend=TieredCache(
+        remote=RedisCache(
+            redis=redis_client,
+            prefix="users",
+            ttl=settings.cache.user_ttl,
+        ),
+        local=LocalCache(
+            max_size=settings.cache.local_max_size,
+            ttl=settings.cache.local_ttl,
+        ),
+        bus=invalidation_bus,
+    ),
+    negative_ttl=settings.cache.negative_ttl,
+    enabled=settings.cache.enabled,
+)
@@ -1,21 +1,72 @@
 import logging
+from typing import Any, Iterable, Mapping, Sequence
 
-from redis.asyncio import ConnectionPool, Redis
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialWithJitterBackoff
+from redis.exceptions import ConnectionError
 
-from core.config import settings
+from core.config import RedisConfig, settings
 
 logger = logging.getLogger(__name__)
 
 
+class ReconnectBackoff(ExponentialWithJitterBackoff):
+    """Exponential backoff with jitter counting the retries it schedules."""
+
+    def __init__(self, cap: float, base: float) -> None:
+        super().__init__(cap=cap, base=base)
+        self.retries = 0
+
+    def __deepcopy__(self, memo: dict) -> "ReconnectBackoff":
+        # connections copy their retry policy, the counter stays shared
+        return self
+
+    def compute(self, failures: int) -> float:
+        self.retries += 1
+        return super().compute(failures)
+
+
 class RedisClient:
-    def __init__(self, url) -> None:
-        self.url = url
-        self._pool: ConnectionPool | None = None
+    """
+    Async Redis client on a bounded connection pool.
+
+    Once `max_connections` are in use, callers wait up to `pool_timeout`
+    for a free connection instead of opening new ones. Commands failing
+    with connection errors are retried on a fresh connection with
+    exponential backoff, idle connections are pinged before reuse.
+    Timeouts are not retried: the command may have run, and replaying
+    scripts or INCR would count twice.
+    """
+
+    def __init__(self, config: RedisConfig) -> None:
+        self.url = str(config.url)
+        self.config = config
+        self._backoff = ReconnectBackoff(
+            cap=self.config.retry_backoff_cap,
+            base=self.config.retry_backoff_base,
+        )
+        self._pool: BlockingConnectionPool | None = None
         self._client: Redis | None = None
+        self._commands = 0
+        self._round_trips = 0
 
     async def init(self) -> None:
         try:
-            self._pool = ConnectionPool.from_url(self.url)
+            self._pool = BlockingConnectionPool.from_url(
+                self.url,
+                max_connections=self.config.max_connections,
+                timeout=self.config.pool_timeout,
+                socket_timeout=self.config.socket_timeout,
+                socket_connect_timeout=self.config.socket_connect_timeout,
+                socket_keepalive=True,
+                health_check_interval=self.config.health_check_interval,
+                retry=Retry(
+                    self._backoff,
+                    self.config.retry_attempts,
+                    supported_errors=(ConnectionError,),
+                ),
+            )
             self._client = Redis(connection_pool=self._pool)  # type: ignore
             await self._client.ping()  # type: ignore
             logger.info("Redis client initialized")
@@ -35,5 +86,72 @@ class RedisClient:
             )
         return self._client
 
+    def _chunks(self, items: Sequence[Any]) -> list[Sequence[Any]]:
+        size = self.config.batch_size
+        return [items[i : i + size] for i in range(0, len(items), size)]
+
+    async def execute_many(self, commands: Sequence[Sequence[Any]]) -> list[Any]:
+        """
+        Run commands such as `("INCR", key)` in non transactional pipelines
+        of up to `batch_size` commands, results are returned in order.
+        """
+        results: list[Any] = []
+        for chunk in self._chunks(commands):
+            async with self.client.pipeline(transaction=False) as pipe:
+                for command in chunk:
+                    pipe.execute_command(*command)
+                results += await pipe.execute()
+            self._round_trips += 1
+        self._commands += len(commands)
+        return results
+
+    async def mget(self, keys: Sequence[str]) -> list[bytes | None]:
+        """`MGET` split into commands of up to `batch_size` keys, one round trip."""
+        if not keys:
+            return []
+        chunks = self._chunks(keys)
+        if len(chunks) == 1:
+            self._commands += 1
+            self._round_trips += 1
+            return await self.client.mget(keys)
+        values: list[bytes | None] = []
+        for chunk_values in await self.execute_many(
+            [("MGET", *chunk) for chunk in chunks]
+        ):
+            values += chunk_values
+        return values
+
+    async def set_many(
+        self,
+        items: Mapping[str, bytes | str],
+        ex: int | None = None,
+    ) -> None:
+        """`SET` every item, with `ex` seconds to live if given, in pipelines."""
+        expire = ("EX", ex) if ex else ()
+        await self.execute_many(
+            [("SET", key, value, *expire) for key, value in items.items()]
+        )
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """`DEL` the keys in commands of up to `batch_size` keys."""
+        chunks = self._chunks(list(keys))
+        if not chunks:
+            return 0
+        return sum(await self.execute_many([("DEL", *chunk) for chunk in chunks]))
+
+    def stats(self) -> dict[str, int]:
+        # the pool has no public counters, its private sets may change
+        # between redis-py versions, missing ones are reported as 0
+        in_use = getattr(self._pool, "_in_use_connections", ())
+        idle = getattr(self._pool, "_available_connections", ())
+        return {
+            "max_connections": self.config.max_connections,
+            "in_use": len(in_use),
+            "idle": len(idle),
+            "batched_commands": self._commands,
+            "round_trips": self._round_trips,
+            "retries": self._backoff.retries,
+        }
+
 
-redis_client = RedisClient(str(settings.redis.url))
+redis_client = RedisClient(settings.redis)
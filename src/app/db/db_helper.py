@@ -1,5 +1,6 @@
 import logging
-from typing import AsyncGenerator
+import uuid
+from typing import Any, AsyncGenerator
 
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -7,13 +8,31 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import NullPool
 
 from core.config import settings
 
+from .pool import InstrumentedQueuePool
+from .query_log import SlowQueryLog, slow_query_log
+from .tracked_session import TrackedAsyncSession
+
 log = logging.getLogger(__name__)
 
 
+def _prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4().hex}__"
+
+
 class DatabaseHelper:
+    """
+    Engine and session factory of one database.
+
+    With `external_pooler` the connections are pooled by PgBouncer (or a
+    similar pooler) in transaction mode: the engine does not keep its own
+    pool, and prepared statements are not cached and get unique names,
+    since consecutive transactions may run on different server connections.
+    """
+
     def __init__(
         self,
         url: str,
@@ -21,21 +40,59 @@ class DatabaseHelper:
         echo_pool: bool = False,
         pool_size: int = 5,
         max_overflow: int = 10,
+        pool_timeout: float = 30,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+        statement_cache_size: int = 100,
+        prepared_statement_cache_size: int = 100,
+        external_pooler: bool = False,
+        command_timeout: float | None = None,
+        slow_query_log: SlowQueryLog | None = None,
     ) -> None:
+        self.external_pooler = external_pooler
+        if external_pooler:
+            pool_options: dict[str, Any] = {"poolclass": NullPool}
+            connect_args: dict[str, Any] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": _prepared_statement_name,
+            }
+        else:
+            pool_options = {
+                "poolclass": InstrumentedQueuePool,
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_timeout": pool_timeout,
+                "pool_recycle": pool_recycle,
+                "pool_pre_ping": pool_pre_ping,
+            }
+            connect_args = {
+                "statement_cache_size": statement_cache_size,
+                "prepared_statement_cache_size": prepared_statement_cache_size,
+            }
         self.engine: AsyncEngine = create_async_engine(
             url=url,
             echo=echo,
             echo_pool=echo_pool,
-            pool_size=pool_size,
-            max_overflow=max_overflow,
+            connect_args={**connect_args, "command_timeout": command_timeout},
+            **pool_options,
         )
+        if slow_query_log is not None:
+            slow_query_log.attach(self.engine)
         self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
             bind=self.engine,
             autoflush=False,
             autocommit=False,
             expire_on_commit=False,
+            class_=TrackedAsyncSession,
         )
 
+    def pool_stats(self) -> dict[str, Any]:
+        """Checked out / overflow connections and checkout wait times."""
+        if self.external_pooler:
+            return {"external_pooler": True}
+        return self.engine.pool.stats()
+
     async def dispose(self) -> None:
         await self.engine.dispose()
         log.info("Database engine disposed")
@@ -51,4 +108,12 @@ db_helper = DatabaseHelper(
     echo_pool=settings.db.echo_pool,
     pool_size=settings.db.pool_size,
     max_overflow=settings.db.max_overflow,
+    pool_timeout=settings.db.pool_timeout,
+    pool_recycle=settings.db.pool_recycle,
+    pool_pre_ping=settings.db.pool_pre_ping,
+    statement_cache_size=settings.db.statement_cache_size,
+    prepared_statement_cache_size=settings.db.prepared_statement_cache_size,
+    external_pooler=settings.db.external_pooler,
+    command_timeout=settings.db.command_timeout,
+    slow_query_log=slow_query_log,
 )
@@ -0,0 +1,81 @@
+import bisect
+import time
+from typing import Any
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+# upper bounds of the acquire time buckets, in milliseconds
+ACQUIRE_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class AcquireTimeHistogram:
+    """Cumulative histogram of the time spent waiting for a pooled connection."""
+
+    def __init__(self, buckets_ms: tuple[int, ...] = ACQUIRE_BUCKETS_MS) -> None:
+        self.buckets_ms = buckets_ms
+        self._counts = [0] * (len(buckets_ms) + 1)
+        self._count = 0
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+        self._timeouts = 0
+
+    def observe(self, elapsed_ms: float) -> None:
+        self._counts[bisect.bisect_left(self.buckets_ms, elapsed_ms)] += 1
+        self._count += 1
+        self._sum_ms += elapsed_ms
+        self._max_ms = max(self._max_ms, elapsed_ms)
+
+    def observe_timeout(self) -> None:
+        self._timeouts += 1
+
+    def stats(self) -> dict[str, Any]:
+        buckets: dict[str, int] = {}
+        total = 0
+        for bound, count in zip((*self.buckets_ms, "+Inf"), self._counts):
+            total += count
+            buckets[f"le_{bound}"] = total
+        return {
+            "count": self._count,
+            "sum_ms": round(self._sum_ms, 3),
+            "max_ms": round(self._max_ms, 3),
+            "timeouts": self._timeouts,
+            "buckets": buckets,
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    `AsyncAdaptedQueuePool` recording how long each checkout waited,
+    including the pre-ping and opening of new connections.
+
+    The histogram survives `recreate()`, so `engine.dispose()` keeps it.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.acquire_histogram = AcquireTimeHistogram()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.acquire_histogram.observe_timeout()
+            raise
+        self.acquire_histogram.observe((time.perf_counter() - start) * 1000)
+        return connection
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.acquire_histogram = self.acquire_histogram
+        return pool
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "acquire_time": self.acquire_histogram.stats(),
+        }
@@ -0,0 +1,102 @@
+import logging
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Awaitable, Callable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.config import settings
+
+log = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+# outermost repository method of the current call chain, e.g. "UserRepository.get_all"
+current_repository_call: ContextVar[str | None] = ContextVar(
+    "current_repository_call",
+    default=None,
+)
+
+_START_TIMES_KEY = "query_start_times"
+_MAX_STATEMENT_LENGTH = 1000
+
+
+def track_repository_call(
+    method: Callable[..., Awaitable[R]],
+) -> Callable[..., Awaitable[R]]:
+    """Name the repository method in `current_repository_call` while it runs."""
+
+    @wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> R:
+        if current_repository_call.get() is not None:
+            return await method(self, *args, **kwargs)
+        token = current_repository_call.set(f"{type(self).__name__}.{method.__name__}")
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            current_repository_call.reset(token)
+
+    return wrapper
+
+
+def _parameters_shape(parameters: Any) -> Any:
+    """Types of the bound parameters, values are not logged."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany
+            return f"{len(parameters)} x {_parameters_shape(parameters[0])}"
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class SlowQueryLog:
+    """
+    Logs statements running longer than `threshold_ms` with their
+    parameter types, duration and the repository method that issued them.
+    """
+
+    def __init__(self, threshold_ms: int = 500) -> None:
+        self.threshold_ms = threshold_ms
+        self._slow_queries = 0
+
+    def attach(self, engine: AsyncEngine) -> None:
+        if not self.threshold_ms:
+            return
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after)
+        event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_START_TIMES_KEY, []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        start = conn.info[_START_TIMES_KEY].pop()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms < self.threshold_ms:
+            return
+        self._slow_queries += 1
+        log.warning(
+            "Slow query %.1f ms in %s: %s; parameters: %s",
+            elapsed_ms,
+            current_repository_call.get() or "<no repository>",
+            statement[:_MAX_STATEMENT_LENGTH],
+            _parameters_shape(parameters),
+        )
+
+    def _on_error(self, exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get(_START_TIMES_KEY):
+            connection.info[_START_TIMES_KEY].pop()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "threshold_ms": self.threshold_ms,
+            "slow_queries": self._slow_queries,
+        }
+
+
+slow_query_log = SlowQueryLog(threshold_ms=settings.db.slow_query_threshold_ms)
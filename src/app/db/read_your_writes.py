@@ -0,0 +1,47 @@
+import logging
+
+from redis.exceptions import RedisError
+
+from app.clients.redis import RedisClient, redis_client
+from core.config import settings
+
+log = logging.getLogger(__name__)
+
+
+class PrimaryStickiness:
+    """
+    Read-your-writes deadlines of principals, kept in Redis.
+
+    Once a principal commits writes, its reads go to the primary for
+    `window` seconds on every worker, so replica lag does not hide its own
+    changes. The deadline never leaves the server. When Redis can not be
+    asked, reads go to the primary.
+    """
+
+    key_prefix = "db:primary:"
+
+    def __init__(self, redis: RedisClient, window: int) -> None:
+        self.redis = redis
+        self.window = window
+
+    def _key(self, principal: str) -> str:
+        return f"{self.key_prefix}{principal}"
+
+    async def stick(self, principal: str) -> None:
+        try:
+            await self.redis.client.set(self._key(principal), 1, ex=self.window)
+        except (RedisError, RuntimeError) as e:
+            log.warning("Failed to pin %s to the primary: %s", principal, e)
+
+    async def is_stuck(self, principal: str) -> bool:
+        try:
+            return bool(await self.redis.client.exists(self._key(principal)))
+        except (RedisError, RuntimeError) as e:
+            log.warning("Failed to check primary stickiness of %s: %s", principal, e)
+            return True
+
+
+primary_stickiness = PrimaryStickiness(
+    redis_client,
+    window=settings.db.read_your_writes_window,
+)
@@ -0,0 +1,128 @@
+import asyncio
+import itertools
+import logging
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.config import settings
+
+from .db_helper import DatabaseHelper, db_helper
+from .query_log import slow_query_log
+
+log = logging.getLogger(__name__)
+
+
+class Replica:
+    def __init__(self, name: str, helper: DatabaseHelper) -> None:
+        self.name = name
+        self.helper = helper
+        self.healthy = True
+
+
+class ReplicaRouter:
+    """
+    Hands out session factories of read replicas round-robin.
+
+    Replicas are pinged every `health_check_interval` seconds; failing ones
+    are skipped until they answer again. Without healthy replicas reads go
+    to the primary.
+    """
+
+    def __init__(
+        self,
+        primary: DatabaseHelper,
+        replicas: list[Replica],
+        health_check_interval: float = 5.0,
+        health_check_timeout: float = 2.0,
+    ) -> None:
+        self.primary = primary
+        self.replicas = replicas
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self._cycle = itertools.cycle(replicas)
+        self._task: asyncio.Task | None = None
+
+    def get_session_maker(self) -> async_sessionmaker[AsyncSession]:
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if replica.healthy:
+                return replica.helper.session_factory
+        return self.primary.session_factory
+
+    async def _ping(self, replica: Replica) -> None:
+        try:
+            async with asyncio.timeout(self.health_check_timeout):
+                async with replica.helper.engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+        except (SQLAlchemyError, OSError, TimeoutError) as e:
+            if replica.healthy:
+                log.warning("Replica %s is unavailable: %s", replica.name, e)
+            replica.healthy = False
+        else:
+            if not replica.healthy:
+                log.info("Replica %s is available again", replica.name)
+            replica.healthy = True
+
+    async def check(self) -> None:
+        await asyncio.gather(*(self._ping(replica) for replica in self.replicas))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await self.check()
+
+    async def start(self) -> None:
+        if self.replicas and self._task is None:
+            await self.check()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.helper.dispose()
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "pool": replica.helper.pool_stats(),
+            }
+            for replica in self.replicas
+        ]
+
+
+replica_router = ReplicaRouter(
+    primary=db_helper,
+    replicas=[
+        Replica(
+            name=f"{url.hosts()[0]['host']}:{url.hosts()[0]['port']}",
+            helper=DatabaseHelper(
+                url=str(url),
+                echo=settings.db.echo,
+                echo_pool=settings.db.echo_pool,
+                pool_size=settings.db.pool_size,
+                max_overflow=settings.db.max_overflow,
+                pool_timeout=settings.db.pool_timeout,
+                pool_recycle=settings.db.pool_recycle,
+                pool_pre_ping=settings.db.pool_pre_ping,
+                statement_cache_size=settings.db.statement_cache_size,
+                prepared_statement_cache_size=settings.db.prepared_statement_cache_size,
+                external_pooler=settings.db.external_pooler,
+                command_timeout=settings.db.command_timeout,
+                slow_query_log=slow_query_log,
+            ),
+        )
+        for url in settings.db.replica_urls
+    ],
+    health_check_interval=settings.db.replica_health_check_interval,
+)
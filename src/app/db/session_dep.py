@@ -1,13 +1,23 @@
 import logging
 from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
-from functools import wraps
+from functools import partial, wraps
 
-from fastapi import Depends
-from sqlalchemy import text
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.auth.validation import get_request_principal
+
 from .db_helper import db_helper
+from .read_your_writes import PrimaryStickiness, primary_stickiness
+from .replica_router import ReplicaRouter, replica_router
+from .tracked_session import (
+    after_commit,
+    has_writes,
+    is_connected,
+    set_statement_timeout,
+    statement_timeout_ms,
+)
 
 log = logging.getLogger(__name__)
 
@@ -15,26 +25,74 @@ log = logging.getLogger(__name__)
 class DatabaseSessionManager:
     """
     Класс для управления асинхронными сессиями базы данных, включая поддержку транзакций и зависимости FastAPI.
+
+    Сессии без транзакции читают с реплик из `replica_router`, сессии с транзакцией
+    работают с основной базой. После коммита изменений пользователь (или IP
+    анонимного клиента) ещё `stickiness.window` секунд читает с основной базы,
+    чтобы видеть свои изменения. Срок хранится на сервере, см. `PrimaryStickiness`.
+
+    Соединение берётся из пула только при первом запросе к базе, а COMMIT
+    выполняется только если в транзакции были изменения.
     """
 
-    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        replica_router: ReplicaRouter | None = None,
+        stickiness: PrimaryStickiness | None = None,
+    ):
         self.session_maker = session_maker
+        self.replica_router = replica_router
+        self.stickiness = stickiness
+        self._sessions = 0
+        self._checkouts = 0
+        self._commits = 0
+        self._commits_skipped = 0
+
+    @property
+    def has_replicas(self) -> bool:
+        return self.replica_router is not None and bool(self.replica_router.replicas)
+
+    @property
+    def read_your_writes(self) -> bool:
+        return (
+            self.has_replicas
+            and self.stickiness is not None
+            and self.stickiness.window > 0
+        )
 
     @asynccontextmanager
-    async def create_session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def create_session(
+        self,
+        session_maker: async_sessionmaker[AsyncSession] | None = None,
+    ) -> AsyncGenerator[AsyncSession, None]:
         """
         Создаёт и предоставляет новую сессию базы данных.
         Гарантирует закрытие сессии по завершении работы.
         """
-        async with self.session_maker() as session:
+        async with (session_maker or self.session_maker)() as session:
+            self._sessions += 1
             try:
                 yield session
             except Exception as e:
                 log.error("Ошибка при создании сессии базы данных")
                 raise e
             finally:
+                if is_connected(session):
+                    self._checkouts += 1
                 await session.close()
 
+    async def _commit(self, session: AsyncSession) -> None:
+        """
+        Коммит, если в сессии были изменения. Транзакция без изменений
+        завершается откатом при возврате соединения в пул.
+        """
+        if has_writes(session):
+            await session.commit()
+            self._commits += 1
+        else:
+            self._commits_skipped += 1
+
     @asynccontextmanager
     async def transaction(self, session: AsyncSession) -> AsyncGenerator[None, None]:
         """
@@ -42,24 +100,49 @@ class DatabaseSessionManager:
         """
         try:
             yield
-            await session.commit()
+            await self._commit(session)
         except Exception:
             await session.rollback()
             log.error("Ошибка транзакции")
             raise
 
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def _read_session_maker(
+        self,
+        request: Request,
+    ) -> async_sessionmaker[AsyncSession]:
+        """
+        Фабрика сессий для чтения: реплика, либо основная база в окне read-your-writes.
+        """
+        if not self.has_replicas:
+            return self.session_maker
+        if self.read_your_writes and await self.stickiness.is_stuck(
+            get_request_principal(request)
+        ):
+            return self.session_maker
+        return self.replica_router.get_session_maker()
+
+    async def get_session(self, request: Request) -> AsyncGenerator[AsyncSession, None]:
         """
         Зависимость для FastAPI, возвращающая сессию без управления транзакцией.
         """
-        async with self.create_session() as session:
+        session_maker = await self._read_session_maker(request)
+        async with self.create_session(session_maker) as session:
             yield session
 
-    async def get_transaction_session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def get_transaction_session(
+        self,
+        request: Request,
+    ) -> AsyncGenerator[AsyncSession, None]:
         """
         Зависимость для FastAPI, возвращающая сессию с управлением транзакцией.
         """
         async with self.create_session() as session:
+            if self.read_your_writes:
+                # только если изменения действительно закоммичены
+                after_commit(
+                    session,
+                    partial(self.stickiness.stick, get_request_principal(request)),
+                )
             async with self.transaction(session):
                 yield session
 
@@ -78,16 +161,15 @@ class DatabaseSessionManager:
                 async with self.session_maker() as session:
                     try:
                         if isolation_level:
-                            await session.execute(
-                                text(
-                                    f"SET TRANSACTION ISOLATION LEVEL {isolation_level}"
-                                )
+                            # уровень изоляции задаётся при BEGIN, без отдельного запроса
+                            await session.connection(
+                                execution_options={"isolation_level": isolation_level}
                             )
 
                         result = await method(*args, session=session, **kwargs)
 
                         if commit:
-                            await session.commit()
+                            await self._commit(session)
 
                         return result
                     except Exception as e:
@@ -101,6 +183,34 @@ class DatabaseSessionManager:
 
         return decorator
 
+    def statement_timeout(self, timeout_ms: int) -> Callable:
+        """
+        Зависимость для роутов: ограничивает каждый запрос к базе в рамках
+        обработки запроса `timeout_ms` миллисекундами (SET LOCAL statement_timeout).
+
+        Зависит от сессии без транзакции (та же сессия, что и у сервисов роута):
+        если другая зависимость уже начала в ней транзакцию, таймаут ставится
+        сразу, иначе при BEGIN.
+        """
+
+        async def set_timeout(
+            session: AsyncSession = Depends(self.get_session),
+        ) -> None:
+            statement_timeout_ms.set(timeout_ms)
+            if session.in_transaction():
+                await set_statement_timeout(session, timeout_ms)
+
+        return Depends(set_timeout)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "sessions": self._sessions,
+            "checkouts": self._checkouts,
+            "checkouts_avoided": self._sessions - self._checkouts,
+            "commits": self._commits,
+            "commits_skipped": self._commits_skipped,
+        }
+
     @property
     def session_dependency(self) -> Callable:
         """Возвращает зависимость для FastAPI, обеспечивающую доступ к сессии без транзакции."""
@@ -113,7 +223,11 @@ class DatabaseSessionManager:
 
 
 # Инициализация менеджера сессий базы данных
-session_manager = DatabaseSessionManager(db_helper.session_factory)
+session_manager = DatabaseSessionManager(
+    db_helper.session_factory,
+    replica_router=replica_router,
+    stickiness=primary_stickiness,
+)
 
 # Зависимости FastAPI для использования сессий
 SessionDep = session_manager.session_dependency
@@ -0,0 +1,117 @@
+import logging
+from contextvars import ContextVar
+from typing import Awaitable, Callable
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction
+
+log = logging.getLogger(__name__)
+
+CONNECTED_KEY = "connected"
+HAS_WRITES_KEY = "has_writes"
+AFTER_COMMIT_KEY = "after_commit"
+COMMITTED_CALLBACKS_KEY = "committed_callbacks"
+
+# statement timeout in milliseconds applied to transactions begun in this context
+statement_timeout_ms: ContextVar[int | None] = ContextVar(
+    "statement_timeout_ms",
+    default=None,
+)
+
+
+class TrackedSession(Session):
+    """
+    Session recording in `info` whether it checked out a connection
+    and whether it issued anything but SELECT statements.
+
+    Transactions begun while `statement_timeout_ms` is set run with that
+    `statement_timeout`.
+    """
+
+
+class TrackedAsyncSession(AsyncSession):
+    """
+    Async session running the callbacks registered with `after_commit`
+    once `commit()` has returned. Callbacks of rolled back transactions
+    are dropped.
+    """
+
+    sync_session_class = TrackedSession
+
+    async def commit(self) -> None:
+        await super().commit()
+        for callback in self.info.pop(COMMITTED_CALLBACKS_KEY, []):
+            try:
+                await callback()
+            except Exception:
+                log.exception("After commit callback %r failed", callback)
+
+
+def after_commit(
+    session: Session | AsyncSession,
+    callback: Callable[[], Awaitable[None]],
+) -> None:
+    """
+    Run `callback` after the current transaction commits, e.g. to drop
+    cache entries, so concurrent readers can not re-cache the old rows.
+    """
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+
+def has_writes(session: Session | AsyncSession) -> bool:
+    """Whether the session wrote anything or has changes still to flush."""
+    return session.info.get(HAS_WRITES_KEY, False) or bool(
+        session.new or session.dirty or session.deleted
+    )
+
+
+def is_connected(session: Session | AsyncSession) -> bool:
+    return session.info.get(CONNECTED_KEY, False)
+
+
+def _set_config_statement_timeout(timeout_ms: int):
+    # SET LOCAL does not accept bind parameters, set_config(..., true) is its equivalent
+    return select(func.set_config("statement_timeout", str(timeout_ms), True))
+
+
+async def set_statement_timeout(session: AsyncSession, timeout_ms: int) -> None:
+    """Limit the remaining statements of the current transaction to `timeout_ms`."""
+    await session.execute(_set_config_statement_timeout(timeout_ms))
+
+
+@event.listens_for(TrackedSession, "after_begin")
+def _after_begin(
+    session: Session,
+    transaction: SessionTransaction,
+    connection: Connection,
+) -> None:
+    session.info[CONNECTED_KEY] = True
+    timeout_ms = statement_timeout_ms.get()
+    if timeout_ms:
+        connection.execute(_set_config_statement_timeout(timeout_ms))
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _after_commit(session: Session) -> None:
+    session.info[COMMITTED_CALLBACKS_KEY] = session.info.pop(AFTER_COMMIT_KEY, [])
+
+
+@event.listens_for(TrackedSession, "after_transaction_end")
+def _after_transaction_end(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        # not committed: rolled back or closed
+        session.info.pop(AFTER_COMMIT_KEY, None)
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _after_flush(session: Session, flush_context) -> None:
+    session.info[HAS_WRITES_KEY] = True
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _do_orm_execute(orm_execute_state: ORMExecuteState) -> None:
+    # DML and textual statements, SELECT ... FOR UPDATE is not a write
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[HAS_WRITES_KEY] = True
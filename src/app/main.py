@@ -3,11 +3,9 @@ import uvicorn
 from app.api.api_v1 import router as api_v1_router
 from app.api.middlewares.cors_middleware import register_cors_middleware
 from app.create_app import create_app
-from app.rate_limiter import limiter
 from core.config import settings
 
 main_app = create_app()
-main_app.state.limiter = limiter
 main_app.include_router(
     api_v1_router,
     prefix=settings.api.prefix,
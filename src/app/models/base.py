@@ -1,3 +1,5 @@
+from typing import Any, ClassVar
+
 from sqlalchemy import MetaData
 from sqlalchemy.orm import (
     DeclarativeBase,
@@ -14,6 +16,9 @@ class Base(DeclarativeBase):
     metadata = MetaData(
         naming_convention=settings.db.naming_convention,
     )
+    # server generated columns come back with INSERT ... RETURNING
+    # instead of a separate SELECT after flush
+    __mapper_args__: ClassVar[dict[str, Any]] = {"eager_defaults": True}
 
     @declared_attr.directive
     def __tablename__(cls) -> str:
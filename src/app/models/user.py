@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, ForeignKey
+from sqlalchemy import Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -21,6 +21,35 @@ class User(
     CreatedAtMixin,
     UpdatedAtMixin,
 ):
+    __table_args__ = (
+        # keyset pagination of the admin users list
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # admin search, see UserRepository.filter_strategies
+        Index(
+            "ix_users_phone_number_pattern",
+            "phone_number",
+            postgresql_ops={"phone_number": "text_pattern_ops"},
+        ),
+        Index(
+            "ix_users_full_name_trgm",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ),
+        # FilterStrategy.FULL_TEXT, the config must match full_text_config
+        Index(
+            "ix_users_full_name_fts",
+            text("to_tsvector('simple'::regconfig, full_name)"),
+            postgresql_using="gin",
+        ),
+        # delete_unverified_users cleanup task
+        Index(
+            "ix_users_unverified_created_at",
+            "created_at",
+            postgresql_where=text("is_verified IS false"),
+        ),
+    )
+
     _id_autoincrement = True
     _id_primary_key = True
     _phone_number_unique = True
@@ -30,6 +59,11 @@ class User(
         default=False,
         server_default="false",
     )
+    is_verified: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        server_default="false",
+    )
     role: Mapped[str] = mapped_column(
         ForeignKey("roles.name"),
         default="user",
@@ -1,32 +1,314 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import inspect
+import logging
+import math
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, NamedTuple
 
+from fastapi import Depends, Request, Response
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+from app.clients.redis import RedisClient, redis_client
 from core.config import settings
+from core.exceptions import RateLimitError
+
+log = logging.getLogger(__name__)
+
+# Sliding window counter: the previous window's count is weighted by the
+# part of it still covered by the sliding window.
+# KEYS[1] - current window counter, KEYS[2] - previous window counter
+# ARGV[1] - limit, ARGV[2] - period in ms, ARGV[3] - ms elapsed in the current window,
+# ARGV[4] - requests to admit, fewer are granted when the window is almost full
+# Returns {granted, requests counted in the window, retry after in ms}
+SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local elapsed = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local count = previous * (period - elapsed) / period + current
+local granted = math.min(requested, math.floor(limit - count))
+if granted < 1 then
+    local retry_after = period - elapsed
+    if current + 1 <= limit and previous > 0 then
+        -- wait until enough of the previous window slides out
+        local weight = (limit - current - 1) / previous
+        retry_after = math.max(period * (1 - weight) - elapsed, 1)
+    end
+    return {0, math.ceil(count), math.ceil(retry_after)}
+end
+redis.call('INCRBY', KEYS[1], granted)
+redis.call('PEXPIRE', KEYS[1], period * 2)
+return {granted, math.ceil(count + granted), 0}
+"""
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    # seconds until the window frees up / until the next request is allowed
+    reset_after: int
+    retry_after: int
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset_after),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+class RateLimiter:
+    """
+    Sliding window rate limiter on Redis.
+
+    Each check is one atomic script call on the async client, nothing blocks
+    the event loop. When Redis is unavailable or not initialized requests
+    are let through.
+    """
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        prefix: str = "rate_limit",
+    ) -> None:
+        self.redis = redis
+        self.prefix = prefix
+        self._script: AsyncScript | None = None
+
+    @property
+    def script(self) -> AsyncScript:
+        if self._script is None:
+            self._script = self.redis.client.register_script(SLIDING_WINDOW_SCRIPT)
+        return self._script
+
+    async def acquire(
+        self,
+        key: str,
+        limit: int,
+        period: int,
+        permits: int = 1,
+    ) -> tuple[int, RateLimitResult]:
+        """
+        Admit up to `permits` requests for `key`, at most `limit` per
+        `period` seconds. Returns the number granted and the resulting state.
+        """
+        period_ms = period * 1000
+        now_ms = int(time.time() * 1000)
+        window, elapsed = divmod(now_ms, period_ms)
+        reset_after = math.ceil((period_ms - elapsed) / 1000)
+        try:
+            granted, count, retry_after_ms = await self.script(
+                keys=[
+                    f"{self.prefix}:{key}:{window}",
+                    f"{self.prefix}:{key}:{window - 1}",
+                ],
+                args=[limit, period_ms, elapsed, permits],
+            )
+        except (RedisError, RuntimeError) as e:
+            # RuntimeError: the client is not initialized
+            log.error("Rate limiter is unavailable, letting request through: %s", e)
+            return permits, RateLimitResult(True, limit, limit, reset_after, 0)
+        return granted, RateLimitResult(
+            allowed=granted > 0,
+            limit=limit,
+            remaining=max(limit - count, 0),
+            reset_after=reset_after,
+            retry_after=math.ceil(retry_after_ms / 1000),
+        )
+
+    async def hit(
+        self,
+        key: str,
+        limit: int,
+        period: int,
+    ) -> RateLimitResult:
+        """Count a request for `key`, at most `limit` per `period` seconds."""
+        _, result = await self.acquire(key, limit, period)
+        return result
 
 
-def get_default_rate_limit() -> str:
-    """Get default rate limit string from settings.
+class Lease:
+    __slots__ = ("denied_until", "expires_at", "result", "tokens")
 
-    Returns a rate limit string like "100/minute" or "60/second".
+    def __init__(self, tokens: int, expires_at: float, result: RateLimitResult) -> None:
+        self.tokens = tokens
+        self.expires_at = expires_at
+        self.denied_until = 0.0
+        self.result = result
+
+
+class LocalRateLimiter:
     """
-    requests = settings.rate_limiter.default_requests
-    period = settings.rate_limiter.default_period
+    Per-worker pre-limiter in front of `RateLimiter`.
+
+    Permits are leased from Redis in batches of up to `batch_size` (and at
+    most `max_share` of the limit) and spent locally until the window ends,
+    so most allowed requests skip Redis. Once Redis refuses, the denial is
+    cached until `Retry-After`, so a flood of rejected requests does not
+    reach Redis either. Leased permits are already counted in Redis, so the
+    limit holds across workers; the price is that permits a worker leased
+    but did not spend are unavailable to the others until the window ends.
+    """
+
+    def __init__(
+        self,
+        limiter: RateLimiter,
+        batch_size: int = 10,
+        max_share: float = 0.25,
+        max_keys: int = 10_000,
+    ) -> None:
+        self.limiter = limiter
+        self.batch_size = batch_size
+        self.max_share = max_share
+        self.max_keys = max_keys
+        self._leases: OrderedDict[str, Lease] = OrderedDict()
+        self._local_decisions = 0
+        self._remote_calls = 0
 
-    # Convert period to a human-readable format
-    period_map = {
-        60: "minute",
-        3600: "hour",
-        86400: "day",
-    }
+    def _batch(self, limit: int) -> int:
+        return max(1, min(self.batch_size, int(limit * self.max_share)))
 
-    if period in period_map:
-        return f"{requests}/{period_map[period]}"
-    # For custom periods, use "per X seconds"
-    return f"{requests}/{period} seconds"
+    @staticmethod
+    def _local_result(lease: Lease, now: float) -> RateLimitResult:
+        result = lease.result._replace(
+            reset_after=max(math.ceil(lease.expires_at - now), 0),
+        )
+        if result.allowed:
+            return result._replace(remaining=result.remaining + lease.tokens)
+        return result._replace(retry_after=math.ceil(lease.denied_until - now))
 
+    async def hit(
+        self,
+        key: str,
+        limit: int,
+        period: int,
+    ) -> RateLimitResult:
+        now = time.monotonic()
+        lease = self._leases.get(key)
+        if lease is not None and now < lease.expires_at:
+            if lease.tokens > 0:
+                lease.tokens -= 1
+                self._local_decisions += 1
+                return self._local_result(lease, now)
+            if now < lease.denied_until:
+                self._local_decisions += 1
+                return self._local_result(lease, now)
 
-limiter = Limiter(
-    key_func=get_remote_address,
-    # default_limits=[get_default_rate_limit()], # If you want to set a default rate limit to all routers
-    storage_uri=str(settings.redis.url),
+        self._remote_calls += 1
+        granted, result = await self.limiter.acquire(
+            key, limit, period, permits=self._batch(limit)
+        )
+        lease = Lease(
+            tokens=max(granted - 1, 0),
+            expires_at=now + result.reset_after,
+            result=result,
+        )
+        if not result.allowed:
+            lease.denied_until = now + result.retry_after
+        self._leases[key] = lease
+        self._leases.move_to_end(key)
+        if len(self._leases) > self.max_keys:
+            self._leases.popitem(last=False)
+        return self._local_result(lease, now)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "keys": len(self._leases),
+            "local_decisions": self._local_decisions,
+            "remote_calls": self._remote_calls,
+        }
+
+
+rate_limiter = RateLimiter(redis_client, prefix=settings.rate_limiter.key_prefix)
+local_rate_limiter = LocalRateLimiter(
+    rate_limiter,
+    batch_size=settings.rate_limiter.local_batch_size,
+    max_share=settings.rate_limiter.local_max_share,
+    max_keys=settings.rate_limiter.local_max_keys,
 )
+
+
+def get_client_ip(request: Request) -> str:
+    return request.client.host if request.client else "127.0.0.1"
+
+
+class RateLimit:
+    """
+    FastAPI dependency allowing `limit` requests per `period` seconds
+    for each client of a route, keyed by `key_func` (client IP by default).
+
+    Sets `X-RateLimit-*` headers, and raises `RateLimitError` with
+    `Retry-After` once the limit is reached.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        period: int,
+        scope: str | None = None,
+        key_func: Callable[[Request], str] = get_client_ip,
+        limiter: RateLimiter | LocalRateLimiter = local_rate_limiter,
+    ) -> None:
+        self.limit = limit
+        self.period = period
+        self.scope = scope
+        self.key_func = key_func
+        self.limiter = limiter
+
+    async def __call__(self, request: Request, response: Response) -> None:
+        scope = self.scope
+        if scope is None:
+            route = request.scope.get("route")
+            scope = f"{request.method}:{route.path if route else request.url.path}"
+        result = await self.limiter.hit(
+            f"{scope}:{self.key_func(request)}",
+            limit=self.limit,
+            period=self.period,
+        )
+        if not result.allowed:
+            raise RateLimitError(
+                message="Too many requests",
+                headers=result.headers(),
+            )
+        response.headers.update(result.headers())
+
+
+def rate_limit(
+    limit: int = settings.rate_limiter.default_requests,
+    period: int = settings.rate_limiter.default_period,
+    **kwargs: Any,
+) -> Callable:
+    """
+    Decorator form of `RateLimit` for route functions,
+    must be applied below the router decorator.
+    """
+    dependency = RateLimit(limit, period, **kwargs)
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def wrapper(*args: Any, _rate_limit: None = None, **kw: Any) -> Any:
+            return await func(*args, **kw)
+
+        wrapper.__signature__ = signature.replace(  # type: ignore[attr-defined]
+            parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(
+                    "_rate_limit",
+                    inspect.Parameter.KEYWORD_ONLY,
+                    default=Depends(dependency),
+                ),
+            ]
+        )
+        return wrapper
+
+    return decorator
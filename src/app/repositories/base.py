@@ -1,18 +1,93 @@
 import enum
+import inspect
 import logging
-from typing import Any, Generic, List, Optional, Tuple, TypeVar, Union
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    ClassVar,
+    Generic,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-from sqlalchemy import ColumnElement, Select, asc, delete, desc, select, update
+from pydantic import BaseModel
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Row,
+    Select,
+    any_,
+    asc,
+    bindparam,
+    delete,
+    desc,
+    func,
+    literal_column,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.query_log import track_repository_call
+from app.db.tracked_session import after_commit
 from app.models.base import Base
+from core.enums.filter_strategy import FilterStrategy
+
+from .pagination import decode_cursor, encode_cursor, keyset_condition
 
 log = logging.getLogger(__name__)
+# Postgres accepts at most 32767 bind parameters per statement
+MAX_BIND_PARAMS = 32767
 T = TypeVar("T", bound=Base)
+# column names or a schema whose fields name the columns to load
+Projection = Union[Sequence[str], type[BaseModel]]
+# filter shape strategy of None values, rendered as IS NULL without a parameter
+IS_NULL = "is_null"
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# get_all / get_page / find_one statements keyed on their shape, values are
+# bind parameters, so calls differing only in values reuse one statement
+# and SQLAlchemy's compiled cache entry
+STATEMENT_CACHE_SIZE = 1024
+_statement_cache: dict[tuple, Select] = {}
+
+
+def _cached_statement(key: tuple, build: Callable[[], Select]) -> Select:
+    stmt = _statement_cache.get(key)
+    if stmt is None:
+        if len(_statement_cache) >= STATEMENT_CACHE_SIZE:
+            _statement_cache.pop(next(iter(_statement_cache)))
+        stmt = _statement_cache[key] = build()
+    return stmt
+
+
+def _track_public_methods(cls: type) -> None:
+    # slow query log names the repository method that issued a statement
+    for name, attr in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.iscoroutinefunction(attr):
+            setattr(cls, name, track_repository_call(attr))
 
 
 class BaseRepository(Generic[T]):
+    # how string filters of `get_all` are matched, per column name;
+    # columns not listed here use FilterStrategy.TRIGRAM
+    filter_strategies: ClassVar[dict[str, FilterStrategy]] = {}
+    full_text_config: ClassVar[str] = "simple"
+
     def __init__(
         self,
         session: AsyncSession,
@@ -21,12 +96,39 @@ class BaseRepository(Generic[T]):
         self.session = session
         self.model = model
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        _track_public_methods(cls)
+
     async def get_by_id(
         self,
         id: Any,
     ) -> T | None:
         return await self.session.get(self.model, id)
 
+    async def get_row_by_id(
+        self,
+        id_: Any,
+        columns: Projection,
+    ) -> Row | None:
+        """
+        Get only the given columns of an object by id,
+        as a lightweight row that is not tracked by the session.
+        """
+        stmt = self._select(columns).where(self.model.id == id_)
+        result = await self.session.execute(stmt)
+        return result.first()
+
+    async def invalidate(self, ids: List[Any]) -> None:
+        """
+        Hook called once updates or deletes of rows are committed.
+        Repositories that cache rows override it to drop stale entries.
+        """
+
+    def _invalidate_after_commit(self, ids: List[Any]) -> None:
+        if ids:
+            after_commit(self.session, partial(self.invalidate, list(ids)))
+
     async def add(self, instance: T) -> T:
         """
         Add a new object to the database.
@@ -35,7 +137,6 @@ class BaseRepository(Generic[T]):
         try:
             self.session.add(instance)
             await self.session.flush()
-            await self.session.refresh(instance)
             return instance
         except SQLAlchemyError as e:
             await self.session.rollback()
@@ -48,6 +149,7 @@ class BaseRepository(Generic[T]):
     ):
         """
         Add multiple objects to the database.
+        Goes through the unit of work, use `insert_many` for large batches.
         """
         log.info(f"Adding multiple {self.model.__name__}. Count: {len(instances)}")
         try:
@@ -58,13 +160,202 @@ class BaseRepository(Generic[T]):
             log.error(f"Error adding multiple {self.model.__name__}: {e}")
             raise
 
-    async def get_all(  # noqa
+    async def insert_many(
+        self,
+        rows: List[dict],
+        chunk_size: int = 1000,
+        on_conflict: Optional[Literal["nothing", "update"]] = None,
+        conflict_columns: Optional[List[str]] = None,
+        update_columns: Optional[List[str]] = None,
+        returning: Optional[Projection] = None,
+    ) -> list[Row]:
+        """
+        Insert rows with multi-row INSERT ... RETURNING statements,
+        bypassing the unit of work. All rows must have the same keys.
+
+        - chunk_size: rows per statement, lowered to fit the bind parameter limit
+        - on_conflict: "nothing" skips conflicting rows, "update" overwrites
+          `update_columns` of the existing row (ON CONFLICT on `conflict_columns`),
+          both are required then
+        - returning: columns to return for inserted (or updated) rows,
+          the primary key by default
+        Returns one row per inserted (or updated) record.
+        """
+        if on_conflict == "update" and not (conflict_columns and update_columns):
+            raise ValueError(
+                'on_conflict="update" needs conflict_columns and update_columns'
+            )
+        if not rows:
+            return []
+        returning_columns = (
+            self._projection(returning)
+            if returning is not None
+            else list(self.model.__mapper__.primary_key)
+        )
+        # column defaults are rendered for every row too
+        params_per_row = len(self.model.__table__.columns)
+        chunk_size = max(1, min(chunk_size, MAX_BIND_PARAMS // params_per_row))
+
+        log.info(f"Bulk inserting {len(rows)} {self.model.__name__}")
+        inserted: list[Row] = []
+        try:
+            for start in range(0, len(rows), chunk_size):
+                stmt = pg_insert(self.model).values(rows[start : start + chunk_size])
+                if on_conflict == "nothing":
+                    stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+                elif on_conflict == "update":
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=conflict_columns,
+                        set_={c: stmt.excluded[c] for c in update_columns},
+                    )
+                result = await self.session.execute(stmt.returning(*returning_columns))
+                inserted.extend(result.all())
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            log.error(f"Error bulk inserting {self.model.__name__}: {e}")
+            raise
+        return inserted
+
+    def _projection(self, columns: Projection) -> list:
+        if isinstance(columns, type) and issubclass(columns, BaseModel):
+            columns = list(columns.model_fields)
+        return [getattr(self.model, name) for name in columns]
+
+    def _select(self, columns: Optional[Projection] = None) -> Select:
+        """Select whole entities, or only `columns` as plain rows."""
+        if columns is None:
+            return select(self.model)
+        return select(*self._projection(columns))
+
+    @staticmethod
+    def _projection_key(columns: Optional[Projection]) -> Any:
+        if columns is None or isinstance(columns, type):
+            return columns
+        return tuple(columns)
+
+    def _filter_shape(self, filters: Optional[dict]) -> Tuple[tuple, dict]:
+        """
+        Split `filters` into their shape, (column name, strategy) pairs,
+        and the values of the bind parameters named `filter_<column>`.
+        None values have the `IS_NULL` strategy and no parameter.
+        """
+        if not filters:
+            return (), {}
+        shape = []
+        params = {}
+        for key, value in filters.items():
+            if getattr(self.model, key, None) is None:
+                continue  # пропускаем несуществующие поля
+
+            if value is None:
+                strategy = IS_NULL
+            # Строковые поля → по стратегии колонки
+            elif isinstance(value, str) and not isinstance(value, enum.Enum):
+                strategy = self.filter_strategies.get(key, FilterStrategy.TRIGRAM)
+                params[f"filter_{key}"] = self._match_value(strategy, value)
+            else:
+                # Прочие поля → обычное сравнение
+                strategy = None
+                params[f"filter_{key}"] = value
+            shape.append((key, strategy))
+        return tuple(shape), params
+
+    def _filter_clauses(
+        self,
+        shape: tuple,
+        params: Optional[dict] = None,
+    ) -> List[ColumnElement[bool]]:
+        """Conditions of a filter shape, bound to `params` when given."""
+        clauses = []
+        for key, strategy in shape:
+            column = getattr(self.model, key)
+            if strategy == IS_NULL:
+                clauses.append(column.is_(None))
+                continue
+            name = f"filter_{key}"
+            value = bindparam(name) if params is None else bindparam(name, params[name])
+            clauses.append(self._match(column, strategy, value))
+        return clauses
+
+    def _apply_filters(
+        self,
+        stmt: Select,
+        filters: Optional[dict],
+    ) -> Select:
+        shape, params = self._filter_shape(filters)
+        if shape:
+            stmt = stmt.where(*self._filter_clauses(shape, params))
+        return stmt
+
+    @staticmethod
+    def _match_value(strategy: FilterStrategy, value: str) -> str:
+        if strategy == FilterStrategy.PREFIX:
+            return f"{escape_like(value)}%"
+        if strategy == FilterStrategy.TRIGRAM:
+            return f"%{escape_like(value)}%"
+        return value
+
+    def _match(
+        self,
+        column: Any,
+        strategy: Optional[FilterStrategy],
+        value: Any,
+    ) -> ColumnElement[bool]:
+        """Condition of `strategy`, `value` is prepared by `_match_value`."""
+        if strategy is None or strategy == FilterStrategy.EXACT:
+            return column == value
+        if strategy == FilterStrategy.PREFIX:
+            return column.like(value, escape="\\")
+        if strategy == FilterStrategy.FULL_TEXT:
+            # the config is inlined so the expression matches the index
+            config = literal_column(f"'{self.full_text_config}'::regconfig")
+            return func.to_tsvector(config, column).op("@@")(
+                func.plainto_tsquery(config, value)
+            )
+        return column.ilike(value, escape="\\")
+
+    @staticmethod
+    def _order_spec(
+        order_by: Optional[List[Union[str, Tuple[str, str]]]],
+    ) -> Tuple[Tuple[str, str], ...]:
+        """Turn ['name', ('age', 'desc')] into (('name', 'asc'), ('age', 'desc'))."""
+        spec = []
+        for item in order_by or ():
+            if isinstance(item, str):
+                # сортировка по возрастанию
+                spec.append((item, "asc"))
+            elif isinstance(item, tuple) and len(item) == 2:  # noqa
+                col_name, direction = item
+                spec.append(
+                    (col_name, "desc" if direction.lower() == "desc" else "asc")
+                )
+        return tuple(spec)
+
+    def _resolve_ordering(
+        self,
+        order_by: List[Union[str, Tuple[str, str]]],
+    ) -> List[Tuple[Any, str]]:
+        """Turn ['name', ('age', 'desc')] into [(column, direction), ...]."""
+        return [
+            (getattr(self.model, col_name), direction)
+            for col_name, direction in self._order_spec(order_by)
+        ]
+
+    @staticmethod
+    def _order_clauses(ordering: List[Tuple[Any, str]]) -> list:
+        return [
+            desc(column) if direction == "desc" else asc(column)
+            for column, direction in ordering
+        ]
+
+    async def get_all(
         self,
         filters: Optional[dict] = None,
         order_by: Optional[List[Union[str, Tuple[str, str]]]] = None,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
-    ) -> list[Optional[T]]:
+        columns: Optional[Projection] = None,
+    ) -> list[Optional[T]] | list[Row]:
         """
         Get all objects with filtering, sorting and pagination.
 
@@ -72,52 +363,48 @@ class BaseRepository(Generic[T]):
           ['name', ('age', 'desc')]
         - limit: maximum number of records
         - offset: offset (for pagination)
+        - columns: load only these columns (names or a schema),
+          rows are returned instead of entities
         """
 
-        stmt: Select = select(self.model)
-
-        try:
-            log.info(f"Searching all {self.model.__name__} by filters: {filters}")
-            if filters:
-                expressions = []
-                for key, value in filters.items():
-                    column = getattr(self.model, key, None)
-                    if column is None:
-                        continue  # пропускаем несуществующие поля
-
-                    # Строковые поля → LIKE
-                    if isinstance(value, str) and not isinstance(value, enum.Enum):
-                        expressions.append(column.ilike(f"%{value}%"))
-                    else:
-                        # Прочие поля → обычное сравнение
-                        expressions.append(column == value)
-
-                if expressions:
-                    stmt = stmt.where(*expressions)
+        shape, params = self._filter_shape(filters)
 
+        def build() -> Select:
+            stmt = self._select(columns).where(*self._filter_clauses(shape))
             if order_by:
-                ordering = []
-                for item in order_by:
-                    if isinstance(item, str):
-                        # сортировка по возрастанию
-                        ordering.append(asc(getattr(self.model, item)))
-                    elif isinstance(item, tuple) and len(item) == 2:  # noqa
-                        col_name, direction = item
-                        col = getattr(self.model, col_name)
-                        if direction.lower() == "desc":
-                            ordering.append(desc(col))
-                        else:
-                            ordering.append(asc(col))
-                stmt = stmt.order_by(*ordering)
-
+                ordering = self._resolve_ordering(order_by)
+                stmt = stmt.order_by(*self._order_clauses(ordering))
             if limit is not None:
-                stmt = stmt.limit(limit)
-
+                stmt = stmt.limit(bindparam("limit", type_=Integer))
             if offset is not None:
-                stmt = stmt.offset(offset)
+                stmt = stmt.offset(bindparam("offset", type_=Integer))
+            return stmt
 
-            result = await self.session.execute(stmt)
-            records = result.unique().scalars().all()
+        stmt = _cached_statement(
+            (
+                "get_all",
+                type(self),
+                self.model,
+                self._projection_key(columns),
+                shape,
+                self._order_spec(order_by),
+                limit is not None,
+                offset is not None,
+            ),
+            build,
+        )
+        if limit is not None:
+            params["limit"] = limit
+        if offset is not None:
+            params["offset"] = offset
+
+        try:
+            log.info(f"Searching all {self.model.__name__} by filters: {filters}")
+            result = await self.session.execute(stmt, params)
+            if columns is None:
+                records = result.unique().scalars().all()
+            else:
+                records = result.all()
             log.info(f"Found {len(records)} {self.model.__name__}.")
             return records
         except SQLAlchemyError as e:
@@ -126,6 +413,112 @@ class BaseRepository(Generic[T]):
             )
             raise
 
+    async def get_page(
+        self,
+        order_by: List[Union[str, Tuple[str, str]]],
+        limit: int,
+        cursor: Optional[str] = None,
+        filters: Optional[dict] = None,
+        columns: Optional[Projection] = None,
+    ) -> Tuple[list[T] | list[Row], Optional[str]]:
+        """
+        Get one page of objects with keyset (cursor) pagination.
+
+        - order_by: same format as in `get_all`, must end with a unique
+          column (e.g. 'id') so that the ordering is total
+        - cursor: `next_cursor` returned for the previous page
+        - columns: load only these columns, ordering columns are added
+        Returns the page and the cursor of the next one (None on the last page).
+        """
+        ordering = self._resolve_ordering(order_by)
+        order_columns = [column for column, _ in ordering]
+        shape, params = self._filter_shape(filters)
+
+        def build() -> Select:
+            if columns is None:
+                stmt: Select = select(self.model)
+            else:
+                selected = self._projection(columns)
+                selected_keys = {column.key for column in selected}
+                selected += [c for c in order_columns if c.key not in selected_keys]
+                stmt = select(*selected)
+            stmt = stmt.where(*self._filter_clauses(shape))
+            if cursor:
+                values = [
+                    bindparam(f"cursor_{idx}", type_=column.type)
+                    for idx, column in enumerate(order_columns)
+                ]
+                stmt = stmt.where(keyset_condition(ordering, values))
+            return stmt.order_by(*self._order_clauses(ordering)).limit(
+                bindparam("limit", type_=Integer)
+            )
+
+        stmt = _cached_statement(
+            (
+                "get_page",
+                type(self),
+                self.model,
+                self._projection_key(columns),
+                shape,
+                self._order_spec(order_by),
+                bool(cursor),
+            ),
+            build,
+        )
+        if cursor:
+            values = decode_cursor(cursor, order_columns)
+            params.update({f"cursor_{idx}": value for idx, value in enumerate(values)})
+        params["limit"] = limit + 1
+
+        try:
+            log.info(f"Fetching page of {self.model.__name__} by filters: {filters}")
+            result = await self.session.execute(stmt, params)
+            records = list(result.scalars() if columns is None else result)
+        except SQLAlchemyError as e:
+            log.error(f"Error fetching page of {self.model.__name__}: {e}")
+            raise
+
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            last = records[-1]
+            next_cursor = encode_cursor(
+                [getattr(last, column.key) for column in order_columns]
+            )
+        return records, next_cursor
+
+    async def stream_all(
+        self,
+        filters: Optional[dict] = None,
+        order_by: Optional[List[Union[str, Tuple[str, str]]]] = None,
+        chunk_size: int = 1000,
+        columns: Optional[Projection] = None,
+    ) -> AsyncIterator[Sequence[T] | Sequence[Row]]:
+        """
+        Stream all objects in chunks through a server-side cursor,
+        so memory usage does not grow with the table size.
+
+        Must be consumed while the session is open.
+        """
+        stmt: Select = self._apply_filters(self._select(columns), filters)
+        if order_by:
+            stmt = stmt.order_by(*self._order_clauses(self._resolve_ordering(order_by)))
+        stmt = stmt.execution_options(yield_per=chunk_size)
+
+        log.info(f"Streaming all {self.model.__name__} by filters: {filters}")
+        try:
+            result = await self.session.stream(stmt)
+            partitions = (
+                result.scalars().partitions()
+                if columns is None
+                else result.partitions()
+            )
+            async for chunk in partitions:
+                yield chunk
+        except SQLAlchemyError as e:
+            log.error(f"Error streaming {self.model.__name__}: {e}")
+            raise
+
     async def update_by_id(
         self,
         id_: Any,
@@ -148,7 +541,9 @@ class BaseRepository(Generic[T]):
 
         try:
             result = await self.session.execute(stmt)
-            return result.scalar_one_or_none()
+            instance = result.scalar_one_or_none()
+            self._invalidate_after_commit([id_])
+            return instance
         except SQLAlchemyError as e:
             await self.session.rollback()
             log.error(e)
@@ -162,38 +557,136 @@ class BaseRepository(Generic[T]):
         stmt = delete(self.model).where(self.model.id == id_)
         try:
             result = await self.session.execute(stmt)
+            self._invalidate_after_commit([id_])
             return result.rowcount > 0
         except SQLAlchemyError as e:
             await self.session.rollback()
             log.error(e)
             raise
 
+    def _id_batches(
+        self,
+        ids: Optional[List[Any]],
+        chunk_size: int,
+    ) -> list[Optional[ColumnElement[bool]]]:
+        """
+        `id = ANY(:ids)` conditions over chunks of `ids`, a single array
+        parameter keeps the statement text the same for any number of ids.
+        """
+        if ids is None:
+            return [None]
+        id_column = self.model.id
+        return [
+            id_column
+            == any_(
+                bindparam(
+                    "ids",
+                    ids[start : start + chunk_size],
+                    type_=ARRAY(id_column.type),
+                )
+            )
+            for start in range(0, len(ids), chunk_size)
+        ]
+
+    async def update_many(
+        self,
+        values: dict,
+        ids: Optional[List[Any]] = None,
+        filters: Optional[List[ColumnElement]] = None,
+        chunk_size: int = 10_000,
+    ) -> list[Any]:
+        """
+        Update all objects matching `ids` and/or `filters`
+        with set-based statements. Returns ids of the updated objects.
+        """
+        if ids is None and not filters:
+            raise ValueError("update_many needs ids or filters")
+        log.info(f"Updating many {self.model.__name__} by filters: {filters}")
+        updated_ids: list[Any] = []
+        try:
+            for id_condition in self._id_batches(ids, chunk_size):
+                conditions = [*(filters or []), id_condition]
+                stmt = (
+                    update(self.model)
+                    .where(*(c for c in conditions if c is not None))
+                    .values(**values)
+                    .returning(self.model.id)
+                )
+                result = await self.session.execute(stmt)
+                updated_ids.extend(result.scalars().all())
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            log.error(e)
+            raise
+        self._invalidate_after_commit(updated_ids)
+        return updated_ids
+
+    async def delete_many(
+        self,
+        ids: Optional[List[Any]] = None,
+        filters: Optional[List[ColumnElement]] = None,
+        chunk_size: int = 10_000,
+    ) -> list[Any]:
+        """
+        Delete all objects matching `ids` and/or `filters`
+        with set-based statements. Returns ids of the deleted objects.
+        """
+        if ids is None and not filters:
+            raise ValueError("delete_many needs ids or filters")
+        log.info(f"Deleting many {self.model.__name__} by filters: {filters}")
+        deleted_ids: list[Any] = []
+        try:
+            for id_condition in self._id_batches(ids, chunk_size):
+                conditions = [*(filters or []), id_condition]
+                stmt = (
+                    delete(self.model)
+                    .where(*(c for c in conditions if c is not None))
+                    .returning(self.model.id)
+                )
+                result = await self.session.execute(stmt)
+                deleted_ids.extend(result.scalars().all())
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            log.error(e)
+            raise
+        self._invalidate_after_commit(deleted_ids)
+        return deleted_ids
+
     async def find_one(
         self,
         filters: List[ColumnElement],
         order_by: Optional[List[Union[str, Tuple[str, str]]]] = None,
-    ) -> Optional[T]:
+        columns: Optional[Projection] = None,
+    ) -> Optional[T] | Optional[Row]:
         """
         Find one object by filters.
+        With `columns`, only those are loaded and a row is returned.
         """
         log.info(f"Finding one {self.model.__name__} by filters: {filters}")
-        stmt = select(self.model)
 
-        for condition in filters:
-            stmt = stmt.where(condition)
+        def build() -> Select:
+            stmt = self._select(columns)
+            if order_by:
+                ordering = self._resolve_ordering(order_by)
+                stmt = stmt.order_by(*self._order_clauses(ordering))
+            return stmt
 
-        if order_by:
-            ordering = []
-            for item in order_by:
-                if isinstance(item, str):
-                    ordering.append(asc(getattr(self.model, item)))
-                else:
-                    col, direction = item
-                    column = getattr(self.model, col)
-                    ordering.append(
-                        desc(column) if direction.lower() == "desc" else asc(column)
-                    )
-            stmt = stmt.order_by(*ordering)
+        # only the filter-independent part is cached, filters carry their values
+        stmt = _cached_statement(
+            (
+                "find_one",
+                type(self),
+                self.model,
+                self._projection_key(columns),
+                self._order_spec(order_by),
+            ),
+            build,
+        ).where(*filters)
 
         result = await self.session.execute(stmt)
-        return result.scalars().first()
+        if columns is None:
+            return result.scalars().first()
+        return result.first()
+
+
+_track_public_methods(BaseRepository)
@@ -0,0 +1,67 @@
+import base64
+import binascii
+from datetime import date, datetime
+from typing import Any, List, Tuple
+
+import orjson
+from sqlalchemy import ColumnElement, and_, or_, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from core.exceptions import BadRequestError
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode ordering values of the last row into an opaque cursor."""
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str,
+    columns: List[InstrumentedAttribute],
+) -> List[Any]:
+    """Decode a cursor back into values typed after the ordering columns."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = orjson.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match the ordering")
+        return [_to_python(column, value) for column, value in zip(columns, values)]
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise BadRequestError(
+            message="Invalid cursor",
+        ) from e
+
+
+def _to_python(column: InstrumentedAttribute, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def keyset_condition(
+    ordering: List[Tuple[InstrumentedAttribute, str]],
+    values: List[Any],
+) -> ColumnElement[bool]:
+    """
+    Condition selecting rows that come after `values` in `ordering`.
+
+    A single row-value comparison is used when all columns share
+    a direction, so Postgres can serve it from a composite index.
+    """
+    directions = {direction for _, direction in ordering}
+    columns = [column for column, _ in ordering]
+    if len(directions) == 1:
+        left, right = tuple_(*columns), tuple_(*values)
+        return left < right if directions == {"desc"} else left > right
+
+    conditions = []
+    for idx, (column, direction) in enumerate(ordering):
+        equal_prefix = [columns[i] == values[i] for i in range(idx)]
+        after = column < values[idx] if direction == "desc" else column > values[idx]
+        conditions.append(and_(*equal_prefix, after))
+    return or_(*conditions)
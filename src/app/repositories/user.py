@@ -1,32 +1,99 @@
-from typing import Type
+import uuid
+from functools import partial
+from typing import Any, ClassVar, List, Sequence, Type
 
+from sqlalchemy import Row, column, select, table, text, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import MISSING, UserCache
+from app.db.tracked_session import after_commit
 from app.models.user import User
+from app.schemas.user import UserRead
+from core.enums.filter_strategy import FilterStrategy
 
-from .base import BaseRepository
+from .base import BaseRepository, Projection
+
+IMPORT_COLUMNS = ("full_name", "phone_number", "hashed_password", "is_active")
 
 
 class UserRepository(BaseRepository[User]):
+    filter_strategies: ClassVar[dict[str, FilterStrategy]] = {
+        "phone_number": FilterStrategy.PREFIX,
+        "full_name": FilterStrategy.TRIGRAM,
+    }
+
     def __init__(
         self,
         session: AsyncSession,
         model: Type[User],
+        cache: UserCache | None = None,
     ):
         super().__init__(session, model)
+        self.cache = cache
+
+    async def invalidate(self, ids: List[Any]) -> None:
+        if self.cache:
+            await self.cache.invalidate(user_ids=ids)
 
     async def get_by_phone(
         self,
         phone_number: str,
     ) -> User | None:
         """Get user by phone."""
+        if self.cache and await self.cache.get_by_phone(phone_number) is None:
+            return None
+        return await self._find_by_phone(phone_number)
+
+    async def _find_by_phone(
+        self,
+        phone_number: str,
+        columns: Projection | None = None,
+    ) -> User | Row | None:
         result = await self.find_one(
             filters=[
                 User.phone_number == phone_number,
             ],
+            columns=columns,
         )
+        if result is None and self.cache:
+            await self.cache.set_missing_phone(phone_number)
         return result
 
+    async def get_read_by_id(
+        self,
+        user_id: int,
+    ) -> UserRead | None:
+        """Get user by id, served from the cache when possible."""
+        if self.cache:
+            cached = await self.cache.get_by_id(user_id)
+            if cached is not MISSING:
+                return cached
+        user = await self.get_row_by_id(user_id, columns=UserRead)
+        if user is None:
+            return None
+        user_read = UserRead.model_validate(user)
+        if self.cache:
+            await self.cache.set(user_read)
+        return user_read
+
+    async def get_read_by_phone(
+        self,
+        phone_number: str,
+    ) -> UserRead | None:
+        """Get user by phone, served from the cache when possible."""
+        if self.cache:
+            cached = await self.cache.get_by_phone(phone_number)
+            if cached is not MISSING:
+                return cached
+        user = await self._find_by_phone(phone_number, columns=UserRead)
+        if user is None:
+            return None
+        user_read = UserRead.model_validate(user)
+        if self.cache:
+            await self.cache.set(user_read)
+        return user_read
+
     async def create(
         self,
         phone_number: str,
@@ -34,10 +101,71 @@ class UserRepository(BaseRepository[User]):
         full_name: str,
     ) -> User:
         """Create a new user."""
-        return await self.add(
+        user = await self.add(
             instance=User(
                 phone_number=phone_number,
                 hashed_password=hashed_password,
                 full_name=full_name,
             ),
         )
+        if self.cache:
+            # drops the "unknown phone" entry cached by the signup lookup
+            after_commit(
+                self.session,
+                partial(self.cache.invalidate, phone_numbers=[phone_number]),
+            )
+        return user
+
+    async def copy_import(
+        self,
+        rows: Sequence[tuple[str, str, str, bool]],
+    ) -> List[Row]:
+        """
+        Bulk load users with COPY and merge them into the users table.
+
+        `rows` are `(full_name, phone_number, hashed_password, is_active)`
+        tuples. They are copied into a temporary staging table dropped on
+        commit, then inserted in one statement skipping phone numbers that
+        are already registered. Users added by an admin count as verified.
+        Returns `(id, phone_number)` of the new users.
+        """
+        staging_name = f"users_import_{uuid.uuid4().hex}"
+        await self.session.execute(
+            text(
+                f"CREATE TEMP TABLE {staging_name} ("
+                "full_name text NOT NULL, "
+                "phone_number text NOT NULL, "
+                "hashed_password text NOT NULL, "
+                "is_active boolean NOT NULL"
+                ") ON COMMIT DROP"
+            )
+        )
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            staging_name,
+            records=rows,
+            columns=IMPORT_COLUMNS,
+        )
+
+        staging = table(staging_name, *(column(name) for name in IMPORT_COLUMNS))
+        stmt = (
+            pg_insert(self.model)
+            .from_select(
+                [*IMPORT_COLUMNS, "is_verified"],
+                select(*staging.c, true()),
+            )
+            .on_conflict_do_nothing(index_elements=["phone_number"])
+            .returning(self.model.id, self.model.phone_number)
+        )
+        result = await self.session.execute(stmt)
+        inserted = list(result.all())
+        if self.cache:
+            after_commit(
+                self.session,
+                partial(
+                    self.cache.invalidate,
+                    phone_numbers=[user.phone_number for user in inserted],
+                ),
+            )
+        return inserted
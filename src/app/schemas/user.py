@@ -34,3 +34,4 @@ class UserUpdate(BaseModel):
 
 class UserUpdateInternal(UserUpdate):
     is_active: bool | None = None
+    is_verified: bool | None = None
@@ -0,0 +1,14 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class UserImportError(BaseModel):
+    row: int
+    phone_number: Optional[str] = None
+    reason: str
+
+
+class UserImportReport(BaseModel):
+    imported: int
+    failed: list[UserImportError]
@@ -1,24 +1,33 @@
+import logging
 from typing import TYPE_CHECKING, Optional
 
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.helpers import (
+    FAMILY_ID_FIELD,
     REFRESH_TOKEN_TYPE,
     create_access_token,
     create_refresh_token,
 )
-from app.auth.utils import hash_password, validate_password
+from app.auth.login_throttle import login_throttle
+from app.auth.password_hasher import password_hasher
+from app.auth.principal import build_principal_claims, principal_versions
+from app.auth.refresh_tokens import refresh_tokens
 from app.auth.validation import get_token_payload, validate_token_type
 from app.repositories.user import UserRepository
 from app.schemas.auth import LoginWithPhone
 from app.schemas.token import RefreshToken, TokenInfo
 from app.schemas.user import UserCreate
-from core.exceptions import AlreadyExistsError
+from core.config import settings
+from core.exceptions import AlreadyExistsError, ServiceUnavailableError
 from core.exceptions.common import AuthenticationError
 
 if TYPE_CHECKING:
     from app.models.user import User
 
+log = logging.getLogger(__name__)
+
 
 class AuthService:
     """Service for authentication."""
@@ -40,7 +49,7 @@ class AuthService:
             raise AlreadyExistsError(
                 message="User already registered",
             )
-        hashed_password = hash_password(user_data.password)
+        hashed_password = await password_hasher.hash(user_data.password)
         user = await self.user_repo.create(
             phone_number=user_data.phone_number,
             hashed_password=hashed_password,
@@ -55,26 +64,50 @@ class AuthService:
     ) -> Optional[tuple["User", str]]:
         user = await self.user_repo.get_by_phone(phone_number=phone_number)
         if user:
-            if validate_password(password, user.hashed_password):
+            if await password_hasher.verify(password, user.hashed_password):
                 return user, user.role
         return None
 
     async def login(
         self,
         login_data: LoginWithPhone,
+        client_ip: Optional[str] = None,
     ) -> TokenInfo:
+        # the attempt is counted, and locked out ones are rejected,
+        # before the user lookup and bcrypt
+        await login_throttle.reserve(login_data.phone_number, client_ip)
         result = await self.authenticate(
             phone_number=login_data.phone_number,
             password=login_data.password,
         )
         if result is None:
             raise AuthenticationError(message="Invalid phone or password")
+        await login_throttle.reset(login_data.phone_number, client_ip)
         user_entity, role = result
-        access_token = create_access_token(str(user_entity.id), role=role)
-        refresh_token = create_refresh_token(str(user_entity.id), role=role)
+        version = 0
+        claims = None
+        if settings.security.stateless_principal:
+            try:
+                version = await principal_versions.ensure(user_entity.id)
+            except RedisError as e:
+                log.error("Failed to get principal version: %s", e)
+                raise ServiceUnavailableError(
+                    message="Login is temporarily unavailable"
+                )
+            claims = build_principal_claims(user_entity, version)
+        family = await refresh_tokens.create(user_entity, version)
         return TokenInfo(
-            access_token=access_token,
-            refresh_token=refresh_token,
+            access_token=create_access_token(
+                str(user_entity.id),
+                role=role,
+                claims=claims,
+            ),
+            refresh_token=create_refresh_token(
+                str(user_entity.id),
+                role=role,
+                family_id=family.family_id,
+                token_id=family.token_id,
+            ),
         )
 
     async def refresh_token(
@@ -94,15 +127,28 @@ class AuthService:
             raise AuthenticationError(
                 message="Invalid token (subject not found)",
             )
-        user = await self.user_repo.get_by_id(int(subject_id))
-        if user is None:
+        family_id = payload.get(FAMILY_ID_FIELD)
+        if family_id is None:
             raise AuthenticationError(
-                message="Invalid token (user not found)",
+                message="Invalid token (family not found)",
             )
-        new_access_token = create_access_token(
-            subject=str(user.id),
-            role=payload.get("role"),
+        # only Redis is checked, deleted users have their families revoked
+        family = await refresh_tokens.rotate(
+            int(subject_id),
+            family_id=family_id,
+            token_id=payload["jti"],
         )
+        claims = family.principal if settings.security.stateless_principal else None
         return TokenInfo(
-            access_token=new_access_token,
+            access_token=create_access_token(
+                subject_id,
+                role=family.role,
+                claims=claims,
+            ),
+            refresh_token=create_refresh_token(
+                subject_id,
+                role=family.role,
+                family_id=family_id,
+                token_id=family.token_id,
+            ),
         )
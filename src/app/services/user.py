@@ -1,10 +1,46 @@
-from typing import Optional
+import csv
+import io
+import logging
+import re
+from datetime import timedelta
+from functools import partial
+from typing import Any, AsyncIterator, Iterator, Optional
 
+import orjson
+from pydantic import ValidationError
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.password_hasher import password_hasher
+from app.auth.principal import principal_versions
+from app.auth.refresh_tokens import refresh_tokens
+from app.db.tracked_session import after_commit
 from app.models.user import User
 from app.repositories.user import UserRepository
-from core.exceptions import NotFoundError
+from app.schemas.pagination import Page
+from app.schemas.user import UserCreateInternal, UserRead, UserUpdate
+from app.schemas.user_import import UserImportError, UserImportReport
+from core.config import settings
+from core.enums.file_format import FileFormat
+from core.exceptions import BadRequestError, NotFoundError, PayloadTooLargeError
+from core.utils.get_current_date import get_current_dt
+
+log = logging.getLogger(__name__)
+
+# cells starting with these are run as formulas by spreadsheet applications
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+# E.164 phone numbers start with "+" but are not formulas, keep them importable
+PHONE_NUMBER_RE = re.compile(r"\+\d+")
+
+
+def _escape_csv_formula(value: Any) -> Any:
+    if (
+        isinstance(value, str)
+        and value.startswith(CSV_FORMULA_PREFIXES)
+        and not PHONE_NUMBER_RE.fullmatch(value)
+    ):
+        return f"'{value}"
+    return value
 
 
 class UserService:
@@ -21,8 +57,8 @@ class UserService:
     async def get_by_id(
         self,
         user_id: int,
-    ) -> "User":
-        user = await self.repo.get_by_id(id=user_id)
+    ) -> UserRead:
+        user = await self.repo.get_read_by_id(user_id)
         if not user:
             raise NotFoundError(
                 message="User not found",
@@ -32,12 +68,29 @@ class UserService:
     async def get_by_phone(
         self,
         phone_number: str,
+    ) -> UserRead:
+        user = await self.repo.get_read_by_phone(phone_number)
+        if not user:
+            raise NotFoundError(
+                message="User not found",
+            )
+        return user
+
+    async def update_user(
+        self,
+        user_id: int,
+        user_data: UserUpdate,
     ) -> "User":
-        user = await self.repo.get_by_phone(phone_number)
+        user = await self.repo.update_by_id(
+            user_id,
+            user_data.model_dump(exclude_unset=True),
+        )
         if not user:
             raise NotFoundError(
                 message="User not found",
+                details={"user_id": user_id},
             )
+        after_commit(self.session, partial(self._refresh_principal, user))
         return user
 
     async def delete_user(
@@ -45,15 +98,209 @@ class UserService:
         user_id: int,
     ) -> None:
         await self.repo.delete_by_id(user_id)
+        after_commit(self.session, partial(self._revoke_principals, [user_id]))
+
+    async def delete_unverified_users(
+        self,
+        expiration_delta: int,
+    ) -> int:
+        """Delete unverified users registered more than `expiration_delta` seconds ago."""
+        deleted_ids = await self.repo.delete_many(
+            filters=[
+                User.is_verified.is_(False),
+                User.created_at
+                < get_current_dt() - timedelta(seconds=expiration_delta),
+            ],
+        )
+        if deleted_ids:
+            after_commit(self.session, partial(self._revoke_principals, deleted_ids))
+        return len(deleted_ids)
+
+    @staticmethod
+    async def _refresh_principal(user: "User") -> None:
+        """Make principals embedded in issued tokens stale, run after commit."""
+        version = 0
+        if settings.security.stateless_principal:
+            try:
+                version = await principal_versions.bump(user.id)
+            except RedisError as e:
+                log.error("Failed to bump principal version of user %s: %s", user.id, e)
+        await refresh_tokens.update_user(user, version)
+
+    @staticmethod
+    async def _revoke_principals(user_ids: list[int]) -> None:
+        """Make tokens of deleted users stale, run after commit."""
+        if settings.security.stateless_principal:
+            try:
+                await principal_versions.bump_many(user_ids)
+            except RedisError as e:
+                log.error("Failed to bump principal versions of %s: %s", user_ids, e)
+        await refresh_tokens.revoke_users(user_ids)
+
+    async def get_all_users(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        filters: Optional[dict] = None,
+    ) -> Page[UserRead]:
+        users, next_cursor = await self.repo.get_page(
+            order_by=[("created_at", "desc"), ("id", "desc")],
+            limit=limit,
+            cursor=cursor,
+            filters=filters,
+            columns=UserRead,
+        )
+        return Page[UserRead](
+            items=[UserRead.model_validate(user) for user in users],
+            next_cursor=next_cursor,
+        )
+
+    async def export_users(
+        self,
+        export_format: FileFormat,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[bytes]:
+        """Yield all users serialized as NDJSON or CSV, one chunk at a time."""
+        if export_format == FileFormat.CSV:
+            yield self._to_csv([], header=True)
+        async for users in self.repo.stream_all(
+            order_by=["id"],
+            chunk_size=chunk_size,
+            columns=UserRead,
+        ):
+            rows = [user._asdict() for user in users]
+            if export_format == FileFormat.CSV:
+                yield self._to_csv(rows)
+            else:
+                yield b"".join(orjson.dumps(row) + b"\n" for row in rows)
 
-    async def get_all_users(self) -> list[Optional["User"]]:
-        return await self.repo.get_all()
+    @staticmethod
+    def _to_csv(
+        rows: list[dict],
+        header: bool = False,
+    ) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(UserRead.model_fields))
+        if header:
+            writer.writeheader()
+        writer.writerows(
+            {key: _escape_csv_formula(value) for key, value in row.items()}
+            for row in rows
+        )
+        return buffer.getvalue().encode()
+
+    async def import_users(
+        self,
+        content: bytes,
+        import_format: FileFormat,
+    ) -> UserImportReport:
+        """
+        Register users from an NDJSON or CSV file.
+
+        Invalid rows, phone numbers repeated in the file and already
+        registered phone numbers are reported instead of failing the import.
+        Files with more than `user_import.max_rows` rows are rejected.
+        """
+        failed: list[UserImportError] = []
+        users: dict[str, tuple[int, UserCreateInternal]] = {}
+        full_name_length = User.__table__.c.full_name.type.length
+        max_rows = settings.user_import.max_rows
+        for row_count, (row_number, row) in enumerate(
+            self._parse_import_rows(content, import_format), start=1
+        ):
+            if row_count > max_rows:
+                raise PayloadTooLargeError(
+                    message=f"Import file has more than {max_rows} rows",
+                )
+            if row is None:
+                failed.append(UserImportError(row=row_number, reason="Invalid row"))
+                continue
+            try:
+                user = UserCreateInternal.model_validate(row)
+            except ValidationError as e:
+                failed.append(
+                    UserImportError(
+                        row=row_number,
+                        phone_number=row.get("phone_number"),
+                        reason="; ".join(
+                            f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                            for error in e.errors()
+                        ),
+                    )
+                )
+                continue
+            if len(user.full_name) > full_name_length:
+                reason = f"full_name: longer than {full_name_length} characters"
+            elif user.phone_number in users:
+                reason = "Duplicate phone number in file"
+            else:
+                users[user.phone_number] = (row_number, user)
+                continue
+            failed.append(
+                UserImportError(
+                    row=row_number,
+                    phone_number=user.phone_number,
+                    reason=reason,
+                )
+            )
+
+        entries = list(users.values())
+        hashed_passwords = await password_hasher.hash_many(
+            [user.password for _, user in entries]
+        )
+        inserted = await self.repo.copy_import(
+            [
+                (user.full_name, user.phone_number, hashed_password, user.is_active)
+                for (_, user), hashed_password in zip(entries, hashed_passwords)
+            ]
+        )
+        inserted_phones = {user.phone_number for user in inserted}
+        failed.extend(
+            UserImportError(
+                row=row_number,
+                phone_number=user.phone_number,
+                reason="Phone number already exists",
+            )
+            for row_number, user in entries
+            if user.phone_number not in inserted_phones
+        )
+        failed.sort(key=lambda error: error.row)
+        return UserImportReport(imported=len(inserted), failed=failed)
+
+    @staticmethod
+    def _parse_import_rows(
+        content: bytes,
+        import_format: FileFormat,
+    ) -> Iterator[tuple[int, Optional[dict]]]:
+        """Yield `(line number, row)` pairs, `row` is `None` if it can not be parsed."""
+        try:
+            text = content.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise BadRequestError(message="Import file must be UTF-8 encoded")
+        if import_format == FileFormat.CSV:
+            reader = csv.DictReader(io.StringIO(text))
+            for row in reader:
+                # empty cells fall back to the schema defaults,
+                # cells beyond the header are dropped
+                yield (
+                    reader.line_num,
+                    {key: value for key, value in row.items() if key and value},
+                )
+            return
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                row = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                row = None
+            yield line_number, row if isinstance(row, dict) else None
 
     async def get_user_by_id(
         self,
         user_id: int,
-    ) -> "User":
-        user = await self.repo.get_by_id(id=user_id)
+    ) -> UserRead:
+        user = await self.repo.get_read_by_id(user_id)
         if not user:
             raise NotFoundError(
                 message="User not found",
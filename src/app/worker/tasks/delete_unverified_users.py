@@ -4,11 +4,13 @@ from typing import Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
 from taskiq import TaskiqDepends
 
+from app.cache import user_cache
 from app.db.db_helper import db_helper
 from app.models.user import User
 from app.repositories.user import UserRepository
 from app.services.user import UserService
 from app.worker import broker
+from core.config import settings
 
 log = logging.getLogger(__name__)
 
@@ -21,10 +23,14 @@ async def delete_unverified_users(
         TaskiqDepends(db_helper.session_getter),
     ],
 ) -> None:
+    if not settings.unverified_users.cleanup_enabled:
+        return
     log.info("Starting deletion of unverified users")
-    repo = UserRepository(session=session, model=User)
+    repo = UserRepository(session=session, model=User, cache=user_cache)
     service = UserService(session=session, repo=repo)
     row_count = await service.delete_unverified_users(
-        expiration_delta=2 * 24 * 60 * 60
-    )  # 2 days
+        expiration_delta=settings.unverified_users.expiration,
+    )
+    # cache invalidation and token revocation run once this commit succeeds
+    await session.commit()
     log.info("Deleted %s unverified users", row_count)
@@ -47,6 +47,7 @@ class ApiV1Prefix(BaseModel):
     auth: str = "/auth"
     users: str = "/users"
     admin: str = "/admins"
+    metrics: str = "/metrics"
 
 
 class ApiPrefix(BaseModel):
@@ -58,6 +59,30 @@ class RedisConfig(BaseModel):
     url: RedisDsn
     port: int
     host: str
+    max_connections: int = 100
+    # seconds to wait for a free connection once max_connections are in use
+    pool_timeout: float = 5
+    socket_timeout: float = 5
+    socket_connect_timeout: float = 5
+    # idle connections are pinged before reuse after this many seconds, 0 disables
+    health_check_interval: int = 30
+    # retries of commands failed with connection errors or timeouts
+    retry_attempts: int = 3
+    # exponential backoff between retries, in seconds
+    retry_backoff_base: float = 0.05
+    retry_backoff_cap: float = 1.0
+    # commands / keys per pipeline round trip of the batch helpers
+    batch_size: int = 500
+
+
+class CacheConfig(BaseModel):
+    enabled: bool = True
+    user_ttl: int = 300  # in seconds
+    negative_ttl: int = 30  # in seconds, for lookups that found nothing
+    # per-process tier in front of Redis
+    local_max_size: int = 10_000
+    local_ttl: int = 30  # in seconds
+    invalidation_channel: str = "cache:invalidate"
 
 
 class FirstAdminConfig(BaseModel):
@@ -83,14 +108,60 @@ class CorsConfig(BaseModel):
 class RateLimiterConfig(BaseModel):
     default_requests: int = 5
     default_period: int = 60  # in seconds
+    key_prefix: str = "rate_limit"
+    # permits a worker leases from Redis at once, 1 asks Redis on every allowed request
+    local_batch_size: int = 10
+    # a lease takes at most this share of the limit
+    local_max_share: float = 0.25
+    local_max_keys: int = 10_000
+
+
+class UserImportConfig(BaseModel):
+    max_file_size: int = 10 * 1024 * 1024  # in bytes
+    max_rows: int = 10_000
+
+
+class UnverifiedUsersConfig(BaseModel):
+    # nothing verifies users yet, enable once a verification flow sets is_verified
+    cleanup_enabled: bool = False
+    expiration: int = 2 * 24 * 60 * 60  # in seconds
+
+
+class PasswordHasherConfig(BaseModel):
+    executor: Literal["thread", "process"] = "thread"
+    max_workers: int = 4
+    max_pending: int = 64  # hashing jobs allowed to wait for a free worker
+    acquire_timeout: float = 5.0  # in seconds
+
+
+class LoginThrottleConfig(BaseModel):
+    enabled: bool = True
+    phone_max_failures: int = 5
+    ip_max_failures: int = 20
+    failure_window: int = 900  # in seconds
+    # first lockout in seconds, doubled on every next one
+    base_lockout: int = 30
+    max_lockout: int = 3600  # in seconds
+    local_max_size: int = 10_000
 
 
 class SecuritySettings(BaseModel):
     private_key_path: Path = SOURCE_DIR / "certs" / "jwt-private.pem"
     public_key_path: Path = SOURCE_DIR / "certs" / "jwt-public.pem"
+    # the kid is derived from the key, this alias is still accepted for tokens
+    # signed with the key loaded at startup
+    key_id: str = "primary"
+    # kid -> public key path of rotated-out keys, still accepted for verification
+    previous_public_keys: dict[str, Path] = {}
+    key_reload_interval: int = 30  # in seconds, 0 disables reloading
     algorithm: str = "RS256"
     access_token_expire_minutes: int = 15
     refresh_token_expire_days: int = 30
+    # verified access tokens are cached until `exp`, disable for strict checks
+    token_cache_enabled: bool = True
+    token_cache_max_size: int = 10_000
+    # embed the user profile into access tokens and skip the per-request lookup
+    stateless_principal: bool = False
     token_type_field: str = "type"
     access_token_type: str = "access"
     refresh_token_type: str = "refresh"
@@ -102,6 +173,28 @@ class DatabaseConfig(BaseModel):
     echo_pool: bool = False
     pool_size: int = 50
     max_overflow: int = 10
+    # seconds to wait for a free connection before failing
+    pool_timeout: float = 30
+    # reconnect connections older than this, -1 keeps them forever
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    # asyncpg prepared statement caches, per connection
+    statement_cache_size: int = 100
+    prepared_statement_cache_size: int = 100
+    # connections are pooled by PgBouncer in transaction mode,
+    # the pool and prepared statement cache settings above are ignored
+    external_pooler: bool = False
+    # client side limit of a single statement, in seconds
+    command_timeout: float | None = 60
+    # server side limit of statements of the admin users search, in milliseconds
+    search_statement_timeout: int = 5000
+    # statements slower than this are logged, in milliseconds, 0 disables
+    slow_query_threshold_ms: int = 500
+    # read replicas used by non transactional sessions
+    replica_urls: list[PostgresDsn] = []
+    replica_health_check_interval: float = 5.0
+    # seconds a client keeps reading from the primary after a write, 0 disables
+    read_your_writes_window: int = 5
 
     naming_convention: dict[str, str] = {
         "ix": "ix_%(column_0_label)s",
@@ -126,11 +219,16 @@ class Settings(BaseSettings):
     db: DatabaseConfig
     api: ApiPrefix = ApiPrefix()
     security: SecuritySettings = SecuritySettings()
+    password_hasher: PasswordHasherConfig = PasswordHasherConfig()
+    login_throttle: LoginThrottleConfig = LoginThrottleConfig()
     redis: RedisConfig
+    cache: CacheConfig = CacheConfig()
     first_admin: FirstAdminConfig
     cors: CorsConfig = CorsConfig()
     s3_client: S3Config
     rate_limiter: RateLimiterConfig = RateLimiterConfig()
+    user_import: UserImportConfig = UserImportConfig()
+    unverified_users: UnverifiedUsersConfig = UnverifiedUsersConfig()
 
 
 settings = Settings()
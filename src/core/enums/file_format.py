@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class FileFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
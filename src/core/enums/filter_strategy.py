@@ -0,0 +1,12 @@
+from enum import StrEnum
+
+
+class FilterStrategy(StrEnum):
+    """How a string filter value is matched, and which index serves it."""
+
+    EXACT = "exact"  # column = value, plain b-tree
+    PREFIX = "prefix"  # column LIKE 'value%', b-tree with text_pattern_ops
+    TRIGRAM = "trigram"  # column ILIKE '%value%', GIN with gin_trgm_ops
+    # to_tsvector(config, column) @@ query, GIN on the same to_tsvector
+    # expression, with the repository's full_text_config spelled out
+    FULL_TEXT = "full_text"
@@ -7,8 +7,10 @@ __all__ = [
     "ExternalServiceError",
     "InternalError",
     "NotFoundError",
+    "PayloadTooLargeError",
     "PermissionDeniedError",
     "RateLimitError",
+    "ServiceUnavailableError",
     "ValidationError",
 ]
 from .base import AppException
@@ -20,7 +22,9 @@ from .common import (
     ExternalServiceError,
     InternalError,
     NotFoundError,
+    PayloadTooLargeError,
     PermissionDeniedError,
     RateLimitError,
+    ServiceUnavailableError,
     ValidationError,
 )
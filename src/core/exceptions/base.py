@@ -9,6 +9,7 @@ class AppException(Exception):
         code: Machine-readable error code for clients.
         status_code: HTTP status code to return.
         details: Additional error details (e.g., field names, IDs).
+        headers: Extra HTTP headers of the error response.
     """
 
     message: str = "An error occurred"
@@ -20,10 +21,12 @@ class AppException(Exception):
         message: str | None = None,
         code: str | None = None,
         details: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
     ):
         self.message = message or self.__class__.message
         self.code = code or self.__class__.code
         self.details = details or {}
+        self.headers = headers
         super().__init__(self.message)
 
     def __repr__(self) -> str:
@@ -43,6 +43,14 @@ class PermissionDeniedError(AppException):
     status_code = 403
 
 
+class PayloadTooLargeError(AppException):
+    """Request body too large (413)."""
+
+    message = "Payload too large"
+    code = "PAYLOAD_TOO_LARGE"
+    status_code = 413
+
+
 class RateLimitError(AppException):
     """Rate limit exceeded (429)."""
 
@@ -70,6 +78,14 @@ class ExternalServiceError(AppException):
     status_code = 503
 
 
+class ServiceUnavailableError(AppException):
+    """Service temporarily overloaded (503)."""
+
+    message = "Service temporarily unavailable"
+    code = "SERVICE_UNAVAILABLE"
+    status_code = 503
+
+
 class DatabaseError(AppException):
     """Database error (500)."""
 
@@ -0,0 +1,93 @@
+"""
+Tokens per second of `encode_jwt` / `decode_jwt` with PEM text, which
+PyJWT parses on every call, and with the keys of `JWTKeyManager`.
+
+Generates a throwaway 2048-bit RSA key pair. Run from `src`:
+
+    python -m scripts.benchmarks.jwt_tokens --seconds 3
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.auth import utils as auth_utils
+from app.auth.keys import JWTKeyManager
+
+PAYLOAD = {"sub": "1", "role": "user", "type": "access"}
+
+
+def generate_keys(directory: Path) -> tuple[Path, Path]:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_path = directory / "private.pem"
+    public_path = directory / "public.pem"
+    private_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    public_path.write_bytes(
+        key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    return private_path, public_path
+
+
+def rate(func: Callable[[], object], seconds: float) -> float:
+    calls = 0
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        func()
+        calls += 1
+    return calls / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        private_path, public_path = generate_keys(Path(directory))
+        private_pem = private_path.read_text()
+        public_pem = public_path.read_text()
+        manager = JWTKeyManager(
+            private_key_path=private_path,
+            public_key_path=public_path,
+            algorithm="RS256",
+            key_id="bench",
+        )
+        _, private_key = manager.signing_key
+        public_key = manager.get_verification_key("bench")
+
+        token = auth_utils.encode_jwt(PAYLOAD, private_key=private_key)
+        cases = {
+            "encode, PEM text": lambda: auth_utils.encode_jwt(
+                PAYLOAD, private_key=private_pem
+            ),
+            "encode, parsed key": lambda: auth_utils.encode_jwt(
+                PAYLOAD, private_key=private_key
+            ),
+            "decode, PEM text": lambda: auth_utils.decode_jwt(
+                token, public_key=public_pem
+            ),
+            "decode, parsed key": lambda: auth_utils.decode_jwt(
+                token, public_key=public_key
+            ),
+        }
+        for name, func in cases.items():
+            print(f"{name:>20}: {rate(func, args.seconds):8.0f} tokens/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Latency of an unrelated endpoint during a login storm.
+
+Compares bcrypt verification run inline on the event loop with
+`PasswordHasher`. Run from `src`:
+
+    python -m scripts.benchmarks.login_storm --logins 200 --pings 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import bcrypt
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.auth.password_hasher import PasswordHasher
+
+PASSWORD = "benchmark-password"
+
+
+def build_app(hasher: PasswordHasher, hashed: bytes) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login/inline")
+    async def login_inline() -> bool:
+        return bcrypt.checkpw(PASSWORD.encode(), hashed)
+
+    @app.post("/login/hasher")
+    async def login_hasher() -> bool:
+        return await hasher.verify(PASSWORD, hashed)
+
+    @app.get("/ping")
+    async def ping() -> str:
+        return "pong"
+
+    return app
+
+
+def percentile(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+async def storm(client: AsyncClient, mode: str, logins: int, pings: int) -> None:
+    latencies: list[float] = []
+
+    async def ping() -> None:
+        # requests arrive every 10 ms whether or not the loop is free,
+        # latency counts from the arrival, as for a real client
+        first = time.perf_counter()
+        for i in range(pings):
+            arrival = first + i * 0.01
+            await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+            await client.get("/ping")
+            latencies.append((time.perf_counter() - arrival) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        ping(),
+        *(client.post(f"/login/{mode}") for _ in range(logins)),
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"{mode:>6}: {logins} logins in {elapsed:.1f} s, /ping "
+        f"p50 {percentile(latencies, 50):.1f} ms, "
+        f"p99 {percentile(latencies, 99):.1f} ms, "
+        f"max {max(latencies):.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--pings", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    hasher = PasswordHasher(max_workers=args.workers, max_pending=args.logins)
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt())
+    transport = ASGITransport(app=build_app(hasher, hashed))
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        for mode in ("inline", "hasher"):
+            await storm(client, mode, args.logins, args.pings)
+    hasher.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+"""
+Per-request overhead of the `RateLimit` dependency, checking every request
+in Redis and with permits leased by `LocalRateLimiter`, against a route
+without a limit.
+
+Uses the configured Redis, or fakeredis (needs `lupa`) with `--fake`.
+Keys live under a throwaway prefix. Run from `src`:
+
+    python -m scripts.benchmarks.rate_limiter --requests 2000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.clients.redis import RedisClient
+from app.rate_limiter import LocalRateLimiter, RateLimit, RateLimiter
+from core.config import settings
+
+# high enough for every benchmark request to be allowed
+LIMIT = 1_000_000
+
+
+def build_app(redis: RedisClient) -> FastAPI:
+    limiter = RateLimiter(redis, prefix=f"bench:{uuid.uuid4().hex}")
+    local_limiter = LocalRateLimiter(limiter, batch_size=100)
+    app = FastAPI()
+
+    @app.get("/plain")
+    async def plain() -> str:
+        return "ok"
+
+    @app.get("/redis", dependencies=[Depends(RateLimit(LIMIT, 60, limiter=limiter))])
+    async def remote() -> str:
+        return "ok"
+
+    @app.get(
+        "/local",
+        dependencies=[Depends(RateLimit(LIMIT, 60, limiter=local_limiter))],
+    )
+    async def local() -> str:
+        return "ok"
+
+    return app
+
+
+async def per_request_us(client: AsyncClient, path: str, requests: int) -> float:
+    for _ in range(min(requests, 100)):  # warm up
+        await client.get(path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await client.get(path)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--fake", action="store_true")
+    args = parser.parse_args()
+
+    redis = RedisClient(settings.redis)
+    if args.fake:
+        from fakeredis import FakeAsyncRedis
+
+        redis._client = FakeAsyncRedis()
+    else:
+        await redis.init()
+
+    transport = ASGITransport(app=build_app(redis))
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        results = {
+            path: await per_request_us(client, path, args.requests)
+            for path in ("/plain", "/redis", "/local")
+        }
+    await redis.close()
+
+    plain = results["/plain"]
+    for path, value in results.items():
+        print(f"{path:>7}: {value:8.1f} us/request, +{value - plain:.1f} us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Per-call overhead of `BaseRepository.get_all` with typical admin filters,
+with statements cached by query shape and rebuilt on every call.
+
+Runs against the configured database, or `--url`, inside a transaction
+that is rolled back. On PostgreSQL the tables are created in a scratch
+schema. Run from `src`:
+
+    python -m scripts.benchmarks.repository_get_all --calls 2000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+from app.models import Role, User
+from app.repositories import base
+from app.repositories.user import UserRepository
+from core.config import settings
+from core.enums.roles import RolesEnum
+
+
+def admin_filters(i: int) -> dict:
+    # values differ on every call, the shape stays the same
+    return {
+        "phone_number": f"+99890{i % 100:02d}",
+        "full_name": f"user {i % 10}",
+        "role": RolesEnum.USER.value,
+        "is_active": i % 2 == 0,
+    }
+
+
+async def create_tables(connection: AsyncConnection, rows: int) -> None:
+    if connection.dialect.name == "postgresql":
+        schema = f"bench_{uuid.uuid4().hex}"
+        await connection.execute(text(f"CREATE SCHEMA {schema}"))
+        await connection.execute(text(f"SET LOCAL search_path TO {schema}"))
+    for table in (Role.__table__, User.__table__):
+        await connection.execute(CreateTable(table))
+    await connection.execute(
+        insert(Role).values([{"name": role.value} for role in RolesEnum])
+    )
+    await connection.execute(
+        insert(User),
+        [
+            {
+                "full_name": f"user {i}",
+                "phone_number": f"+99890{i:07d}",
+                "hashed_password": "hashed",
+                "is_active": i % 2 == 0,
+            }
+            for i in range(rows)
+        ],
+    )
+
+
+async def per_call_us(repo: UserRepository, calls: int) -> float:
+    for i in range(min(calls, 100)):  # warm up caches
+        await repo.get_all(
+            filters=admin_filters(i), order_by=[("id", "desc")], limit=50
+        )
+    start = time.perf_counter()
+    for i in range(calls):
+        await repo.get_all(
+            filters=admin_filters(i), order_by=[("id", "desc")], limit=50
+        )
+    return (time.perf_counter() - start) / calls * 1_000_000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=str(settings.db.url))
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url)
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        await create_tables(connection, args.rows)
+        repo = UserRepository(AsyncSession(bind=connection), User)
+
+        cached = await per_call_us(repo, args.calls)
+        cached_statement = base._cached_statement
+        base._cached_statement = lambda key, build: build()
+        try:
+            rebuilt = await per_call_us(repo, args.calls)
+        finally:
+            base._cached_statement = cached_statement
+        await transaction.rollback()
+    await engine.dispose()
+
+    print(f"shape cache: {cached:8.1f} us/call")
+    print(f"    rebuilt: {rebuilt:8.1f} us/call")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
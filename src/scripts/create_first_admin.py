@@ -20,18 +20,14 @@ async def create_roles() -> None:
             model=Role,
         )
 
-        existing_roles = await role_repo.get_all()
-        existing_role_names = {role.name for role in existing_roles}
-
-        roles_to_add = []
-        for role_enum in RolesEnum:
-            if role_enum.value not in existing_role_names:
-                roles_to_add.append(Role(name=role_enum.value))
-
-        if roles_to_add:
-            await role_repo.add_many(roles_to_add)
-            await session.commit()
-            log.info(f"Added {len(roles_to_add)} new roles")
+        inserted = await role_repo.insert_many(
+            [{"name": role_enum.value} for role_enum in RolesEnum],
+            on_conflict="nothing",
+            conflict_columns=["name"],
+        )
+        await session.commit()
+        if inserted:
+            log.info(f"Added {len(inserted)} new roles")
         else:
             log.info("All roles already exist, skipping role creation")
 
@@ -61,6 +57,7 @@ async def create_first_admin() -> None:
             phone_number=settings.first_admin.phone_number,
             full_name=settings.first_admin.full_name,
             role=RolesEnum.ADMIN.value,
+            is_verified=True,
         )
         await user_repo.add(admin_create)
         await session.commit()
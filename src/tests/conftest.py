@@ -0,0 +1,41 @@
+import uuid
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+from app.models import Role, User
+from core.config import settings
+from core.enums.roles import RolesEnum
+
+
+@pytest.fixture
+async def db_connection() -> AsyncIterator[AsyncConnection]:
+    """
+    Connection to the configured database, inside a transaction rolled back
+    at the end. Tables are created in a scratch schema, without indexes.
+    """
+    engine = create_async_engine(str(settings.db.url))
+    try:
+        connection = await engine.connect()
+    except (OSError, DBAPIError) as e:
+        await engine.dispose()
+        pytest.skip(f"Database is not reachable: {e}")
+    transaction = await connection.begin()
+    schema = f"test_{uuid.uuid4().hex}"
+    try:
+        await connection.execute(text(f"CREATE SCHEMA {schema}"))
+        await connection.execute(text(f"SET LOCAL search_path TO {schema}"))
+        for table in (Role.__table__, User.__table__):
+            await connection.execute(CreateTable(table))
+        await connection.execute(
+            insert(Role).values([{"name": role.value} for role in RolesEnum])
+        )
+        yield connection
+    finally:
+        await transaction.rollback()
+        await connection.close()
+        await engine.dispose()
@@ -0,0 +1,38 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.models import User
+from app.repositories.user import UserRepository
+
+
+async def test_add_loads_server_defaults_with_insert_returning(
+    db_connection: AsyncConnection,
+) -> None:
+    session = AsyncSession(bind=db_connection)
+    repo = UserRepository(session=session, model=User)
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(db_connection.sync_engine, "before_cursor_execute", record)
+    try:
+        user = await repo.add(
+            User(
+                full_name="Test User",
+                phone_number="+998900000001",
+                hashed_password="hashed",
+            )
+        )
+    finally:
+        event.remove(db_connection.sync_engine, "before_cursor_execute", record)
+
+    assert len(statements) == 1, statements
+    assert statements[0].startswith("INSERT INTO users")
+    assert "RETURNING" in statements[0]
+    # server defaults are loaded by the INSERT, reading them issues no SELECT
+    assert user.id is not None
+    assert user.created_at is not None
+    assert user.role == "user"
+    assert user.is_verified is False
+    assert len(statements) == 1, statements